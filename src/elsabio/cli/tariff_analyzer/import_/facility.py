@@ -7,6 +7,7 @@ r"""The entry point of the sub-command `ta import facility` of the Tariff Analyz
 
 # Standard library
 import logging
+from collections.abc import Iterator
 
 # Third party
 import click
@@ -20,18 +21,71 @@ from elsabio.cli.tariff_analyzer.import_.core import (
     validate_import_model,
 )
 from elsabio.config.tariff_analyzer import DataSource
+from elsabio.core import OperationResult
+from elsabio.database import Session, commit
 from elsabio.database.tariff_analyzer import (
     bulk_insert_facilities,
     bulk_update_facilities,
     load_facility_mapping_model,
     load_facility_type_mapping_model,
 )
+from elsabio.operations.core import UpsertDataFrames
 from elsabio.operations.tariff_analyzer import (
-    create_facility_upsert_dataframes,
+    create_facility_upsert_dataframes_chunked,
     validate_facility_import_model,
 )
 
 
+def _upsert_facilities(
+    session: Session, chunks: Iterator[UpsertDataFrames]
+) -> tuple[int, int, OperationResult]:
+    r"""Insert new and update existing facilities chunk by chunk in a single transaction.
+
+    The transaction is committed after the last chunk and rolled back if any chunk
+    fails, such that either all or none of the facilities are saved.
+
+    Parameters
+    ----------
+    session : elsabio.db.Session
+        An active database session.
+
+    chunks : Iterator[elsabio.operations.core.UpsertDataFrames]
+        The DataFrames with facilities to insert and update per chunk.
+
+    Returns
+    -------
+    nr_inserted : int
+        The number of inserted facilities.
+
+    nr_updated : int
+        The number of updated facilities.
+
+    result : elsabio.core.OperationResult
+        The result of inserting and updating the facilities.
+    """
+
+    nr_inserted = 0
+    nr_updated = 0
+
+    for dfs in chunks:
+        result = bulk_insert_facilities(session=session, df=dfs.insert, autocommit=False)
+        if result.ok:
+            result = bulk_update_facilities(session=session, df=dfs.update, autocommit=False)
+
+        if not result.ok:
+            session.rollback()
+            return 0, 0, result
+
+        nr_inserted += dfs.insert.shape[0]
+        nr_updated += dfs.update.shape[0]
+
+    result = commit(session=session, error_msg='Error saving the imported facilities!')
+    if not result.ok:
+        return 0, 0, result
+
+    return nr_inserted, nr_updated, result
+
+
 @click.command(name='facility')
 @click.pass_context
 def facility(ctx: click.Context) -> None:
@@ -66,7 +120,7 @@ def facility(ctx: click.Context) -> None:
             if not result.ok:
                 exit_program(error=True, ctx=ctx, message=result.short_msg)
 
-            dfs, result = create_facility_upsert_dataframes(
+            chunks, df_invalid, result = create_facility_upsert_dataframes_chunked(
                 import_model=import_model,
                 facility_model=facility_model,
                 facility_type_model=facility_type_model,
@@ -74,16 +128,12 @@ def facility(ctx: click.Context) -> None:
             )
             if not result.ok:
                 echo_with_log(result.short_msg, log_level=logging.ERROR, color=Color.ERROR)
-                click.echo(dfs.invalid)
+                click.echo(df_invalid)
                 exit_program(error=True, ctx=ctx)
 
-        result = bulk_insert_facilities(session=session, df=dfs.insert)
-        if not result.ok:
-            exit_program(error=True, ctx=ctx, message=result.short_msg)
-
-        result = bulk_update_facilities(session=session, df=dfs.update)
-        if not result.ok:
-            exit_program(error=True, ctx=ctx, message=result.short_msg)
+            nr_inserted, nr_updated, result = _upsert_facilities(session=session, chunks=chunks)
+            if not result.ok:
+                exit_program(error=True, ctx=ctx, message=result.short_msg)
 
         result = move_processed_files(source_dir=cfg.path)
         if result.ok:
@@ -95,7 +145,7 @@ def facility(ctx: click.Context) -> None:
             error=False,
             ctx=ctx,
             message=(
-                f'Successfully imported {dfs.insert.shape[0]} new facilities '
-                f'and updated {dfs.update.shape[0]} existing facilities!'
+                f'Successfully imported {nr_inserted} new facilities '
+                f'and updated {nr_updated} existing facilities!'
             ),
         )
@@ -208,13 +208,13 @@ def _load_config_from_file(path: Path) -> str:
 
     if path == CONFIG_FILE_PATH:
         if path.exists():
-            content = path.read_text()
+            content = path.read_text(encoding='utf-8')
     elif not path.exists():
         raise exceptions.ConfigFileNotFoundError(
             message=f'The config file "{path}" does not exist!', data=path
         )
     else:
-        content = path.read_text()
+        content = path.read_text(encoding='utf-8')
 
     return content
 
@@ -131,6 +131,8 @@ def bulk_insert_to_table(
     df: pd.DataFrame,
     index: bool = False,
     required_cols: set[str] | None = None,
+    *,
+    autocommit: bool = True,
 ) -> OperationResult:
     r"""Bulk insert a DataFrame into a table.
 
@@ -151,6 +153,11 @@ def bulk_insert_to_table(
     required_cols : set[str] or None, default None
         The required columns that must exist in `df`. If None column validation is omitted.
 
+    autocommit : bool, default True
+        True if the transaction should be committed after the insert. If False the caller
+        is responsible for committing the transaction of `session`. The transaction is
+        rolled back if the insert fails.
+
     Returns
     -------
     result : elsabio.core.OperationResult
@@ -163,16 +170,21 @@ def bulk_insert_to_table(
             return result
 
     try:
-        df.to_sql(name=table, con=session.get_bind(), if_exists='append', index=index)
-    except SQLAlchemyError as e:
+        df.to_sql(name=table, con=session.connection(), if_exists='append', index=index)
+        if autocommit:
+            session.commit()
+    except (SQLAlchemyError, pd.errors.DatabaseError) as e:
+        # pandas wraps the errors of executing the insert statement in a DatabaseError.
+        error = e.__cause__ if isinstance(e.__cause__, SQLAlchemyError) else e
+        session.rollback()
         short_msg = f'Unable to save DataFrame to table "{table}"'
-        long_msg = f'{short_msg}!\n{e!s}'
+        long_msg = f'{short_msg}!\n{error!s}'
         logger.exception(long_msg)
         result = OperationResult(
             ok=False,
             short_msg=short_msg,
             long_msg=long_msg,
-            code=f'{e.__module__}.{e.__class__.__name__}',
+            code=f'{error.__module__}.{error.__class__.__name__}',
         )
     else:
         result = OperationResult(ok=True)
@@ -181,7 +193,12 @@ def bulk_insert_to_table(
 
 
 def bulk_update_table[T: Base](
-    session: Session, model: type[T], df: pd.DataFrame, required_cols: set[str] | None = None
+    session: Session,
+    model: type[T],
+    df: pd.DataFrame,
+    required_cols: set[str] | None = None,
+    *,
+    autocommit: bool = True,
 ) -> OperationResult:
     r"""Bulk update a table by primary key from the contents of a DataFrame.
 
@@ -201,6 +218,11 @@ def bulk_update_table[T: Base](
     required_cols : set[str] or None, default None
         The required columns that must exist in `df`. If None column validation is omitted.
 
+    autocommit : bool, default True
+        True if the transaction should be committed after the update. If False the caller
+        is responsible for committing the transaction of `session`. The transaction is
+        rolled back if the update fails.
+
     Returns
     -------
     elsabio.core.OperationResult
@@ -216,7 +238,8 @@ def bulk_update_table[T: Base](
 
     try:
         session.execute(update(model), records)
-        session.commit()
+        if autocommit:
+            session.commit()
     except SQLAlchemyError as e:
         session.rollback()
         short_msg = f'Unable to update table {model.__tablename__}!'
@@ -55,7 +55,9 @@ def load_facility_mapping_model(
     return FacilityMappingDataFrameModel(df=df), result
 
 
-def bulk_insert_facilities(session: Session, df: pd.DataFrame) -> OperationResult:
+def bulk_insert_facilities(
+    session: Session, df: pd.DataFrame, autocommit: bool = True
+) -> OperationResult:
     r"""Bulk insert facilities into the facility table.
 
     Parameters
@@ -63,6 +65,10 @@ def bulk_insert_facilities(session: Session, df: pd.DataFrame) -> OperationResul
     conn : elsabio.db.Session
         An open session to the database.
 
+    autocommit : bool, default True
+        True if the transaction should be committed after the insert
+        and False to let the caller commit the transaction.
+
     Returns
     -------
     elsabio.core.OperationResult
@@ -74,10 +80,13 @@ def bulk_insert_facilities(session: Session, df: pd.DataFrame) -> OperationResul
         table=Facility.__tablename__,
         df=df,
         required_cols={FacilityDataFrameModel.c_ean, FacilityDataFrameModel.c_facility_type_id},
+        autocommit=autocommit,
     )
 
 
-def bulk_update_facilities(session: Session, df: pd.DataFrame) -> OperationResult:
+def bulk_update_facilities(
+    session: Session, df: pd.DataFrame, autocommit: bool = True
+) -> OperationResult:
     r"""Bulk update existing facilities.
 
     Parameters
@@ -85,6 +94,10 @@ def bulk_update_facilities(session: Session, df: pd.DataFrame) -> OperationResul
     conn : elsabio.db.Session
         An open session to the database.
 
+    autocommit : bool, default True
+        True if the transaction should be committed after the update
+        and False to let the caller commit the transaction.
+
     Returns
     -------
     elsabio.core.OperationResult
@@ -92,5 +105,9 @@ def bulk_update_facilities(session: Session, df: pd.DataFrame) -> OperationResul
     """
 
     return bulk_update_table(
-        session=session, model=Facility, df=df, required_cols={FacilityDataFrameModel.c_facility_id}
+        session=session,
+        model=Facility,
+        df=df,
+        required_cols={FacilityDataFrameModel.c_facility_id},
+        autocommit=autocommit,
     )
@@ -8,10 +8,12 @@ r"""The core data models of ElSabio."""
 # Standard library
 from collections.abc import Hashable
 from enum import StrEnum
+from functools import cache
 from typing import Any, ClassVar
 
 # Third party
 import pandas as pd
+import pyarrow as pa
 from pydantic import BaseModel as PydanticBaseModel
 from pydantic import ConfigDict, ValidationError
 from streamlit_passwordless import User as User
@@ -23,6 +25,19 @@ type DtypeMapping = dict[Hashable, str]
 type ColumnList = list[str]
 
 
+def _to_arrow_type(dtype: str) -> pa.DataType:
+    r"""Convert a pandas dtype string, e.g. 'uint32[pyarrow]', to its Arrow datatype."""
+
+    pd_dtype = pd.api.types.pandas_dtype(dtype)
+
+    if isinstance(pd_dtype, pd.ArrowDtype):
+        return pd_dtype.pyarrow_dtype
+    if isinstance(pd_dtype, pd.StringDtype):
+        return pa.large_string()
+
+    return pa.from_numpy_dtype(pd_dtype)
+
+
 class SerieTypeEnum(StrEnum):
     r"""The available meter data serie types.
 
@@ -188,6 +203,18 @@ class BaseDataFrameModel(BaseModel):
 
         return self.df.dtypes
 
+    @classmethod
+    @cache
+    def arrow_schema(cls) -> pa.Schema:
+        r"""The Arrow schema of the columns of the model derived from `dtypes`.
+
+        The schema is created once per model and cached. It can be used to cast an
+        Arrow table to the datatypes of the model in a single pass, e.g. with
+        :meth:`pyarrow.Table.from_pandas` or :meth:`pyarrow.Table.cast`.
+        """
+
+        return pa.schema((str(name), _to_arrow_type(dtype)) for name, dtype in cls.dtypes.items())
+
 
 class SerieTypeMappingDataFrameModel(BaseDataFrameModel):
     r"""A model of the serie types for mapping `code` to `serie_type_id`.
@@ -15,6 +15,7 @@ from .customer_group import (
 from .import_ import (
     create_facility_contract_upsert_dataframes,
     create_facility_upsert_dataframes,
+    create_facility_upsert_dataframes_chunked,
     create_product_upsert_dataframes,
     create_serie_value_model,
     get_facility_contract_import_interval,
@@ -34,6 +35,7 @@ __all__ = [
     # import_  # noqa: ERA001
     'create_facility_contract_upsert_dataframes',
     'create_facility_upsert_dataframes',
+    'create_facility_upsert_dataframes_chunked',
     'create_product_upsert_dataframes',
     'create_serie_value_model',
     'get_facility_contract_import_interval',
@@ -6,7 +6,11 @@
 r"""The business logic for the data import to the Tariff Analyzer module."""
 
 # Local
-from .facility import create_facility_upsert_dataframes, validate_facility_import_model
+from .facility import (
+    create_facility_upsert_dataframes,
+    create_facility_upsert_dataframes_chunked,
+    validate_facility_import_model,
+)
 from .facility_contract import (
     create_facility_contract_upsert_dataframes,
     get_facility_contract_import_interval,
@@ -19,6 +23,7 @@ from .product import create_product_upsert_dataframes, validate_product_import_d
 __all__ = [
     # facility
     'create_facility_upsert_dataframes',
+    'create_facility_upsert_dataframes_chunked',
     'validate_facility_import_model',
     # facility_contract
     'create_facility_contract_upsert_dataframes',
@@ -7,9 +7,14 @@ r"""The business logic for the facility data import to the Tariff Analyzer modul
 
 # ruff: noqa: S608
 
+# Standard library
+from collections.abc import Iterator
+
 # Third party
 import duckdb
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 
 # Local
 from elsabio.core import OperationResult, has_required_columns
@@ -23,6 +28,19 @@ from elsabio.operations.core import UpsertDataFrames
 from elsabio.operations.validate import validate_duplicate_rows, validate_missing_values
 
 
+def _record_batch_to_df(batch: pa.RecordBatch) -> pd.DataFrame:
+    r"""Convert a record batch to a DataFrame with nullable integer columns.
+
+    Arrow converts integer columns with missing values to float64, which cannot represent
+    all 18 digit EAN codes exactly. :class:`pandas.Int64Dtype` keeps them as integers,
+    like :meth:`duckdb.DuckDBPyRelation.to_df` does for integer columns with missing values.
+    """
+
+    return batch.to_pandas(
+        types_mapper=lambda t: pd.Int64Dtype() if pa.types.is_integer(t) else None
+    )
+
+
 def validate_facility_import_model(
     model: duckdb.DuckDBPyRelation,
 ) -> tuple[OperationResult, pd.DataFrame]:
@@ -87,39 +105,18 @@ def validate_facility_import_model(
     return OperationResult(ok=True), pd.DataFrame()
 
 
-def create_facility_upsert_dataframes(
+def _create_facility_mapping_model(
     import_model: duckdb.DuckDBPyRelation,
     facility_model: FacilityMappingDataFrameModel,
     facility_type_model: FacilityTypeMappingDataFrameModel,
     conn: duckdb.DuckDBPyConnection,
-) -> tuple[UpsertDataFrames, OperationResult]:
-    r"""Create the DataFrames for inserting new and updating existing facilities.
+    sort: bool,
+) -> duckdb.DuckDBPyRelation:
+    r"""Map the facilities to import to their `facility_id` and `facility_type_id`.
 
-    Parameters
-    ----------
-    import_model : duckdb.DuckDBPyRelation
-        The data model with the facilities to import. Should contain
-        at least the columns `ean` and `facility_type_code` from the model
-        :class:`elsabio.models.tariff_analyzer.FacilityImportDataFrameModel`.
-
-    facility_model : elsabio.models.tariff_analyzer.FacilityMappingDataFrameModel
-        The model with the mapping of `facility_id` to `ean`. Used to determine the
-        existing facilities from `import_model` to update and the new ones to import.
-
-    facility_type_model : elsabio.models.tariff_analyzer.FacilityTypeMappingDataFrameModel
-        The model with the mapping of `facility_type_id` to `facility_type_code`. Used to
-        derive the `facility_type_id` of the facilities to import or update.
-
-    conn : duckdb.DuckDBPyConnection
-        The DuckDB connection in which the `import_model` relation exists.
-
-    Returns
-    -------
-    dfs : elsabio.operations.core.UpsertDataFrames
-        The DataFrames with facilities to insert or update.
-
-    result : elsabio.core.OperationResult
-        The result of the creation of the upsert DataFrames.
+    See :func:`create_facility_upsert_dataframes` for a description of the parameters.
+    If `sort` is True the result is ordered by `ean`, which requires DuckDB to
+    evaluate the full result before the first row can be fetched.
     """
 
     # Columns
@@ -132,6 +129,8 @@ def create_facility_upsert_dataframes(
     c_facility_type_code_import = FacilityImportDataFrameModel.c_facility_type_code
     c_facility_type_code = FacilityTypeMappingDataFrameModel.c_code
 
+    df_facility = facility_model.df[[c_facility_id, c_ean]]
+    df_facility_type = facility_type_model.df[[c_facility_type_id, c_facility_type_code]]
     cols = set(import_model.columns)
 
     i_model_name = 'import_model'
@@ -153,6 +152,7 @@ def create_facility_upsert_dataframes(
         for col, dtype in dtypes.items()
         if col in cols
     )
+    order_by_clause = f'ORDER BY\n    {i_model_prefix}.{c_ean} ASC\n' if sort else ''
 
     mapping_query = f"""\
 SELECT
@@ -168,14 +168,82 @@ LEFT OUTER JOIN {f_model_name} {f_model_prefix}
 LEFT OUTER JOIN {ft_model_name} {ft_model_prefix}
     ON {ft_model_prefix}.{c_facility_type_code} = {i_model_prefix}.{c_facility_type_code_import}
 
-ORDER BY
-    {i_model_prefix}.{c_ean} ASC
-"""
+{order_by_clause}"""
 
     import_model.create_view(i_model_name)
-    conn.register(view_name=f_model_name, python_object=facility_model.df)
-    conn.register(view_name=ft_model_name, python_object=facility_type_model.df)
-    rel = conn.sql(query=mapping_query)
+    conn.register(view_name=f_model_name, python_object=df_facility)
+    conn.register(view_name=ft_model_name, python_object=df_facility_type)
+
+    return conn.sql(query=mapping_query)
+
+
+def _create_invalid_facility_type_result(df_invalid: pd.DataFrame) -> OperationResult:
+    r"""Create the result of the facilities with an invalid facility type code."""
+
+    if (nr_invalid := df_invalid.shape[0]) > 0:
+        return OperationResult(
+            ok=False,
+            short_msg=(
+                f'Found facilities ({nr_invalid}) with invalid values for column '
+                f'"{FacilityImportDataFrameModel.c_facility_type_code}"!'
+            ),
+        )
+
+    return OperationResult(ok=True)
+
+
+def create_facility_upsert_dataframes(
+    import_model: duckdb.DuckDBPyRelation,
+    facility_model: FacilityMappingDataFrameModel,
+    facility_type_model: FacilityTypeMappingDataFrameModel,
+    conn: duckdb.DuckDBPyConnection,
+) -> tuple[UpsertDataFrames, OperationResult]:
+    r"""Create the DataFrames for inserting new and updating existing facilities.
+
+    Parameters
+    ----------
+    import_model : duckdb.DuckDBPyRelation
+        The data model with the facilities to import. Should contain
+        at least the columns `ean` and `facility_type_code` from the model
+        :class:`elsabio.models.tariff_analyzer.FacilityImportDataFrameModel`.
+
+    facility_model : elsabio.models.tariff_analyzer.FacilityMappingDataFrameModel
+        The model with the mapping of `facility_id` to `ean`. Used to determine the
+        existing facilities from `import_model` to update and the new ones to import.
+
+    facility_type_model : elsabio.models.tariff_analyzer.FacilityTypeMappingDataFrameModel
+        The model with the mapping of `facility_type_id` to `facility_type_code`. Used to
+        derive the `facility_type_id` of the facilities to import or update.
+
+    conn : duckdb.DuckDBPyConnection
+        The DuckDB connection in which the `import_model` relation exists.
+
+    Returns
+    -------
+    dfs : elsabio.operations.core.UpsertDataFrames
+        The DataFrames with facilities to insert or update.
+
+    result : elsabio.core.OperationResult
+        The result of the creation of the upsert DataFrames.
+
+    See Also
+    --------
+    create_facility_upsert_dataframes_chunked
+        Create the DataFrames in chunks to limit the memory usage of large imports.
+    """
+
+    c_facility_id = FacilityMappingDataFrameModel.c_facility_id
+    c_ean = FacilityDataFrameModel.c_ean
+    c_facility_type_id = FacilityDataFrameModel.c_facility_type_id
+    c_facility_type_code_import = FacilityImportDataFrameModel.c_facility_type_code
+
+    rel = _create_facility_mapping_model(
+        import_model=import_model,
+        facility_model=facility_model,
+        facility_type_model=facility_type_model,
+        conn=conn,
+        sort=True,
+    )
 
     df_insert = (
         rel.filter(f'{c_facility_id} IS NULL')
@@ -194,17 +262,99 @@ ORDER BY
         .set_index(c_facility_id)
     )
 
-    if (nr_invalid := df_invalid.shape[0]) > 0:
-        result = OperationResult(
-            ok=False,
-            short_msg=(
-                f'Found facilities ({nr_invalid}) with invalid '
-                f'values for column "{c_facility_type_code_import}"!'
-            ),
-        )
-    else:
-        result = OperationResult(ok=True)
-
+    result = _create_invalid_facility_type_result(df_invalid=df_invalid)
     dfs = UpsertDataFrames(insert=df_insert, update=df_update, invalid=df_invalid)
 
     return dfs, result
+
+
+def create_facility_upsert_dataframes_chunked(
+    import_model: duckdb.DuckDBPyRelation,
+    facility_model: FacilityMappingDataFrameModel,
+    facility_type_model: FacilityTypeMappingDataFrameModel,
+    conn: duckdb.DuckDBPyConnection,
+    chunk_size: int = 200_000,
+) -> tuple[Iterator[UpsertDataFrames], pd.DataFrame, OperationResult]:
+    r"""Create the DataFrames for inserting new and updating existing facilities in chunks.
+
+    The facilities with an invalid facility type code are collected before any chunk is
+    created, such that no facilities are saved if the import contains invalid data. The
+    chunks are then fetched lazily from DuckDB while iterating, which keeps at most
+    `chunk_size` facilities in memory at once. The facilities are not sorted by `ean`.
+
+    Parameters
+    ----------
+    import_model : duckdb.DuckDBPyRelation
+        The data model with the facilities to import. Should contain
+        at least the columns `ean` and `facility_type_code` from the model
+        :class:`elsabio.models.tariff_analyzer.FacilityImportDataFrameModel`.
+
+    facility_model : elsabio.models.tariff_analyzer.FacilityMappingDataFrameModel
+        The model with the mapping of `facility_id` to `ean`. Used to determine the
+        existing facilities from `import_model` to update and the new ones to import.
+
+    facility_type_model : elsabio.models.tariff_analyzer.FacilityTypeMappingDataFrameModel
+        The model with the mapping of `facility_type_id` to `facility_type_code`. Used to
+        derive the `facility_type_id` of the facilities to import or update.
+
+    conn : duckdb.DuckDBPyConnection
+        The DuckDB connection in which the `import_model` relation exists.
+        Must remain open while iterating over the chunks.
+
+    chunk_size : int, default 200_000
+        The maximum number of facilities to insert and update per chunk.
+
+    Returns
+    -------
+    chunks : Iterator[elsabio.operations.core.UpsertDataFrames]
+        The DataFrames with facilities to insert or update per chunk. The `invalid`
+        DataFrame of each chunk is empty. Nothing is yielded if invalid facilities
+        were found.
+
+    df_invalid : pandas.DataFrame
+        The facilities with an invalid facility type code.
+
+    result : elsabio.core.OperationResult
+        The result of the creation of the upsert DataFrames.
+    """
+
+    c_facility_id = FacilityMappingDataFrameModel.c_facility_id
+    c_ean = FacilityDataFrameModel.c_ean
+    c_facility_type_id = FacilityDataFrameModel.c_facility_type_id
+    c_facility_type_code_import = FacilityImportDataFrameModel.c_facility_type_code
+
+    rel = _create_facility_mapping_model(
+        import_model=import_model,
+        facility_model=facility_model,
+        facility_type_model=facility_type_model,
+        conn=conn,
+        sort=False,
+    )
+
+    df_invalid = (
+        rel.filter(f'{c_facility_type_id} IS NULL')
+        .select(f'{c_facility_id}, {c_ean}, {c_facility_type_id}, {c_facility_type_code_import}')
+        .order(f'{c_ean} ASC')
+        .to_df()
+        .set_index(c_facility_id)
+    )
+
+    result = _create_invalid_facility_type_result(df_invalid=df_invalid)
+    if not result.ok:
+        return iter(()), df_invalid, result
+
+    insert_cols = [
+        col for col in rel.columns if col not in {c_facility_id, c_facility_type_code_import}
+    ]
+    update_cols = [col for col in rel.columns if col != c_facility_type_code_import]
+
+    def create_chunks() -> Iterator[UpsertDataFrames]:
+        for batch in rel.to_arrow_reader(batch_size=chunk_size):
+            is_new = pc.is_null(batch[c_facility_id])
+            yield UpsertDataFrames(
+                insert=_record_batch_to_df(batch.filter(is_new).select(insert_cols)),
+                update=_record_batch_to_df(batch.filter(pc.invert(is_new)).select(update_cols)),
+                invalid=pd.DataFrame(),
+            )
+
+    return create_chunks(), df_invalid, result
@@ -6,6 +6,7 @@
 r"""Configuration for the test suite of ElSabio."""
 
 # Standard library
+import re
 from pathlib import Path
 
 # =============================================================================================
@@ -16,3 +17,11 @@ TEST_DIR = Path(__file__).parent
 STATIC_FILES_BASE_DIR = TEST_DIR / 'static_files'
 STATIC_FILES_CONFIG_BASE_DIR = STATIC_FILES_BASE_DIR / 'config'
 STATIC_FILES_TARIFF_ANALYZER_BASE_DIR = STATIC_FILES_BASE_DIR / 'tariff_analyzer'
+
+# The filename of an import file that has been moved to a sub-directory after successful import.
+FILENAME_WITH_TIMESTAMP_PATTERN = re.compile(
+    r'\d{4}-\d{2}-\d{2}T\d{2}\.\d{2}\.\d{2}[+-]\d{4}_[\w\.]*'
+)
+
+# The placeholders of the static config files, e.g. ':db_url', to substitute in a single pass.
+CONFIG_PLACEHOLDER_PATTERN = re.compile(r"(?<=')(:\w+)(?=')")
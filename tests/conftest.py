@@ -8,14 +8,16 @@ r"""Fixtures for testing ElSabio."""
 # Standard library
 import io
 import logging
-from copy import deepcopy
+import shutil
+from collections.abc import Callable, Mapping
 from pathlib import Path
-from typing import Any
+from types import MappingProxyType
+from typing import Any, cast
 from zoneinfo import ZoneInfo
 
 # Third party
 import pytest
-from sqlalchemy import create_engine, make_url
+from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 # Local
@@ -31,7 +33,7 @@ from elsabio.config import (
 from elsabio.config.tariff_analyzer import DEFAULT_DATA_DIR
 from elsabio.database import URL, SessionFactory, init
 from elsabio.database.models import Base
-from tests.config import STATIC_FILES_CONFIG_BASE_DIR
+from tests.config import CONFIG_PLACEHOLDER_PATTERN, STATIC_FILES_CONFIG_BASE_DIR
 
 # =================================================================================================
 # Config
@@ -39,6 +41,8 @@ from tests.config import STATIC_FILES_CONFIG_BASE_DIR
 
 LOGGER = logging.getLogger()
 
+type ConfigFileFactory = Callable[[str], tuple[Path, str, dict[str, Any]]]
+
 
 @pytest.fixture(autouse=True)
 def reset_log_handlers():
@@ -63,17 +67,17 @@ def remove_config_file_env_var(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.delenv(elsabio.config.config.CONFIG_FILE_ENV_VAR, raising=False)
 
 
-@pytest.fixture
-def config_data(tmp_path: Path) -> tuple[str, dict[str, Any]]:
-    r"""An ElSabio configuration with a SQLite database.
+@pytest.fixture(scope='session')
+def config_data_source() -> str:
+    r"""The source of an ElSabio configuration with a SQLite database.
+
+    The source file is read once per test session. The paths of the database and
+    the web log file are the placeholders ":db_url" and ":web_log_file_path".
 
     Returns
     -------
-    config_data_str : str
+    str
         The configuration as a string of toml.
-
-    config_exp : dict[str, Any]
-        The expected configuration after loading and parsing `config_data_str`.
     """
 
     source_filename = 'ElSabio.toml'
@@ -81,18 +85,120 @@ def config_data(tmp_path: Path) -> tuple[str, dict[str, Any]]:
 
     assert source_config_file_path.exists(), f'File "{source_config_file_path}" does not exist!'
 
-    config_data_str = source_config_file_path.read_text()
+    return source_config_file_path.read_text()
+
+
+@pytest.fixture(scope='session')
+def config_exp_template() -> Mapping[str, Any]:
+    r"""The expected configuration of `config_data_source` excluding the temporary paths.
+
+    The template is created once per test session and shared by all tests. It is frozen
+    with :class:`types.MappingProxyType` and a test that needs to modify a part of it
+    should create a copy with `dict()`. The keys "database" and "logging.file.web.path"
+    are added by `config_data`.
+
+    Returns
+    -------
+    Mapping[str, Any]
+        The expected configuration.
+    """
+
+    bwp_config = MappingProxyType(
+        {
+            'public_key': 'bwp_public_key',
+            'private_key': 'bwp_private_key',
+            'url': BITWARDEN_PASSWORDLESS_API_URL,
+        }
+    )
+    tariff_analyzer = MappingProxyType(
+        {'enabled': True, 'data_dir': DEFAULT_DATA_DIR, 'data': MappingProxyType({})}
+    )
+    stream_config = MappingProxyType(
+        {
+            'stdout': MappingProxyType(
+                {
+                    'stream': Stream.STDOUT,
+                    'disabled': False,
+                    'min_log_level': LogLevel.INFO,
+                    'format': LOGGING_DEFAULT_FORMAT,
+                    'datetime_format': LOGGING_DEFAULT_DATETIME_FORMAT,
+                }
+            ),
+            'stderr': MappingProxyType(
+                {
+                    'stream': Stream.STDERR,
+                    'disabled': False,
+                    'min_log_level': LogLevel.ERROR,
+                    'format': LOGGING_DEFAULT_FORMAT,
+                    'datetime_format': LOGGING_DEFAULT_DATETIME_FORMAT,
+                }
+            ),
+        }
+    )
+    web_file_config = MappingProxyType(
+        {
+            'unique': False,
+            'max_bytes': 1_200_000,
+            'backup_count': 5,
+            'mode': 'a',
+            'encoding': 'UTF-8',
+            'disabled': False,
+            'min_log_level': LogLevel.INFO,
+            'format': LOGGING_DEFAULT_FORMAT,
+            'datetime_format': LOGGING_DEFAULT_DATETIME_FORMAT,
+        }
+    )
+    logging_config = MappingProxyType(
+        {
+            'disabled': False,
+            'min_log_level': LogLevel.INFO,
+            'format': LOGGING_DEFAULT_FORMAT,
+            'datetime_format': LOGGING_DEFAULT_DATETIME_FORMAT,
+            'stream': stream_config,
+            'file': MappingProxyType({'web': web_file_config}),
+            'email': None,
+        }
+    )
+
+    return MappingProxyType(
+        {
+            'timezone': ZoneInfo('Europe/Stockholm'),
+            'languages': (Language.EN,),
+            'default_language': Language.EN,
+            'bwp': bwp_config,
+            'tariff_analyzer': tariff_analyzer,
+            'logging': logging_config,
+        }
+    )
+
+
+@pytest.fixture
+def config_data(
+    config_data_source: str, config_exp_template: Mapping[str, Any], tmp_path: Path
+) -> tuple[str, dict[str, Any]]:
+    r"""An ElSabio configuration with a SQLite database.
+
+    Returns
+    -------
+    config_data_str : str
+        The configuration as a string of toml.
+
+    config_exp : dict[str, Any]
+        The expected configuration after loading and parsing `config_data_str`.
+    """
 
     db_path = tmp_path / 'ElSabio.db'
+    db_url = URL.create('sqlite', database=str(db_path))
     db_url_str = f'sqlite:///{db_path!s}'
     web_log_file_path = tmp_path / 'ElSabio.log'
 
-    config_data_str = config_data_str.replace(':db_url', db_url_str).replace(
-        ':web_log_file_path', str(web_log_file_path)
+    placeholders = {':db_url': db_url_str, ':web_log_file_path': str(web_log_file_path)}
+    config_data_str = CONFIG_PLACEHOLDER_PATTERN.sub(
+        lambda m: placeholders[m[0]], config_data_source
     )
 
     database_config = {
-        'url': tuple(make_url(db_url_str)),
+        'url': tuple(db_url),
         'autoflush': False,
         'expire_on_commit': True,
         'create_database': True,
@@ -100,57 +206,16 @@ def config_data(tmp_path: Path) -> tuple[str, dict[str, Any]]:
         'engine_config': {'echo': True},
     }
 
-    bwp_config = {
-        'public_key': 'bwp_public_key',
-        'private_key': 'bwp_private_key',
-        'url': BITWARDEN_PASSWORDLESS_API_URL,
-    }
-    tariff_analyzer = {'enabled': True, 'data_dir': DEFAULT_DATA_DIR, 'data': {}}
+    logging_template = config_exp_template['logging']
+    web_file_template = logging_template['file']['web']
     logging_config = {
-        'disabled': False,
-        'min_log_level': LogLevel.INFO,
-        'format': LOGGING_DEFAULT_FORMAT,
-        'datetime_format': LOGGING_DEFAULT_DATETIME_FORMAT,
-        'stream': {
-            'stdout': {
-                'stream': Stream.STDOUT,
-                'disabled': False,
-                'min_log_level': LogLevel.INFO,
-                'format': LOGGING_DEFAULT_FORMAT,
-                'datetime_format': LOGGING_DEFAULT_DATETIME_FORMAT,
-            },
-            'stderr': {
-                'stream': Stream.STDERR,
-                'disabled': False,
-                'min_log_level': LogLevel.ERROR,
-                'format': LOGGING_DEFAULT_FORMAT,
-                'datetime_format': LOGGING_DEFAULT_DATETIME_FORMAT,
-            },
-        },
-        'file': {
-            'web': {
-                'unique': False,
-                'path': web_log_file_path,
-                'max_bytes': 1_200_000,
-                'backup_count': 5,
-                'mode': 'a',
-                'encoding': 'UTF-8',
-                'disabled': False,
-                'min_log_level': LogLevel.INFO,
-                'format': LOGGING_DEFAULT_FORMAT,
-                'datetime_format': LOGGING_DEFAULT_DATETIME_FORMAT,
-            }
-        },
-        'email': None,
+        **logging_template,
+        'file': {'web': {**web_file_template, 'path': web_log_file_path}},
     }
 
     config_exp = {
-        'timezone': ZoneInfo('Europe/Stockholm'),
-        'languages': (Language.EN,),
-        'default_language': Language.EN,
+        **config_exp_template,
         'database': database_config,
-        'bwp': bwp_config,
-        'tariff_analyzer': tariff_analyzer,
         'logging': logging_config,
     }
 
@@ -158,9 +223,34 @@ def config_data(tmp_path: Path) -> tuple[str, dict[str, Any]]:
 
 
 @pytest.fixture
-def config_file(
-    config_data: tuple[str, dict[str, Any]], tmp_path: Path
-) -> tuple[Path, str, dict[str, Any]]:
+def write_config_file(config_data: tuple[str, dict[str, Any]], tmp_path: Path) -> ConfigFileFactory:
+    r"""A function for writing the configuration of `config_data` to a config file.
+
+    The function takes the filename of the config file to create in `tmp_path`. Distinct
+    filenames allow multiple config files to coexist in a test.
+
+    Returns
+    -------
+    ConfigFileFactory
+        The function that returns the path to the config file, the configuration
+        as a string of toml and the expected configuration after loading the file.
+    """
+
+    config_data_str, config_exp_original = config_data
+    config_data_bytes = config_data_str.encode()  # Encoded once for all files of a test.
+
+    def _write_config_file(filename: str) -> tuple[Path, str, dict[str, Any]]:
+        config_file_path = tmp_path / filename
+        config_file_path.write_bytes(config_data_bytes)
+        config_exp = {**config_exp_original, 'config_file_path': config_file_path}
+
+        return config_file_path, config_data_str, config_exp
+
+    return _write_config_file
+
+
+@pytest.fixture
+def config_file(write_config_file: ConfigFileFactory) -> tuple[Path, str, dict[str, Any]]:
     r"""An ElSabio config file.
 
     Returns
@@ -175,20 +265,28 @@ def config_file(
         The expected configuration after loading `config_file_path`.
     """
 
-    config_data_str, config_exp_original = config_data
+    return write_config_file('ElSabio.toml')
 
-    config_file_path = tmp_path / 'ElSabio.toml'
-    config_file_path.write_text(config_data_str)
 
-    config_exp = deepcopy(config_exp_original)
-    config_exp['config_file_path'] = config_file_path
+@pytest.fixture
+def set_stdin(monkeypatch: pytest.MonkeyPatch) -> Callable[[str], None]:
+    r"""A function for mocking stdin of the config module with the supplied content.
 
-    return config_file_path, config_data_str, config_exp
+    Returns
+    -------
+    Callable[[str], None]
+        The function that replaces stdin with a stream of its argument.
+    """
+
+    def _set_stdin(content: str = '') -> None:
+        monkeypatch.setattr(elsabio.config.config.sys, 'stdin', io.StringIO(content))
+
+    return _set_stdin
 
 
 @pytest.fixture
 def config_in_stdin(
-    config_data: tuple[str, dict[str, Any]], monkeypatch: pytest.MonkeyPatch
+    config_data: tuple[str, dict[str, Any]], set_stdin: Callable[[str], None]
 ) -> tuple[str, dict[str, Any]]:
     r"""An ElSabio configuration loaded into stdin.
 
@@ -202,26 +300,23 @@ def config_in_stdin(
     """
 
     config_data_str, config_exp_original = config_data
-    config_exp = deepcopy(config_exp_original)
-    config_exp['config_file_path'] = Path('-')
+    config_exp = {**config_exp_original, 'config_file_path': Path('-')}
 
-    monkeypatch.setattr(elsabio.config.config.sys, 'stdin', io.StringIO(config_data_str))
+    set_stdin(config_data_str)
 
     return config_data_str, config_exp
 
 
 @pytest.fixture
-def empty_stdin(monkeypatch: pytest.MonkeyPatch) -> None:
+def empty_stdin(set_stdin: Callable[[str], None]) -> None:
     r"""A mocked stdin that is empty."""
 
-    monkeypatch.setattr(elsabio.config.config.sys, 'stdin', io.StringIO(''))
+    set_stdin('')
 
 
 @pytest.fixture
 def config_file_from_config_env_var(
-    config_data: tuple[str, dict[str, Any]],
-    monkeypatch: pytest.MonkeyPatch,
-    tmp_path: Path,
+    write_config_file: ConfigFileFactory, monkeypatch: pytest.MonkeyPatch
 ) -> tuple[Path, str, dict[str, Any]]:
     r"""The config file environment variable ELSABIO_CONFIG_FILE is defined.
 
@@ -240,13 +335,7 @@ def config_file_from_config_env_var(
         The expected configuration after loading `config_file_path`.
     """
 
-    config_data_str, config_exp_original = config_data
-
-    config_file_path = tmp_path / 'ElSabio_from_env_var.toml'
-    config_file_path.write_text(config_data_str)
-
-    config_exp = deepcopy(config_exp_original)
-    config_exp['config_file_path'] = config_file_path
+    config_file_path, config_data_str, config_exp = write_config_file('ElSabio_from_env_var.toml')
 
     monkeypatch.setenv(elsabio.config.config.CONFIG_FILE_ENV_VAR, str(config_file_path))
 
@@ -255,9 +344,7 @@ def config_file_from_config_env_var(
 
 @pytest.fixture
 def config_file_from_default_location(
-    config_data: tuple[str, dict[str, Any]],
-    monkeypatch: pytest.MonkeyPatch,
-    tmp_path: Path,
+    write_config_file: ConfigFileFactory, monkeypatch: pytest.MonkeyPatch
 ) -> tuple[Path, str, dict[str, Any]]:
     r"""A config file at the default config file location of ElSabio.
 
@@ -276,16 +363,12 @@ def config_file_from_default_location(
         The expected configuration after loading `config_file_path`.
     """
 
-    config_data_str, config_exp_original = config_data
-
-    config_file_path = tmp_path / 'ElSabio_from_default_location.toml'
-    config_file_path.write_text(config_data_str)
+    config_file_path, config_data_str, config_exp = write_config_file(
+        'ElSabio_from_default_location.toml'
+    )
 
     monkeypatch.setattr(elsabio.config.config, 'CONFIG_FILE_PATH', config_file_path)
 
-    config_exp = deepcopy(config_exp_original)
-    config_exp['config_file_path'] = config_file_path
-
     return config_file_path, config_data_str, config_exp
 
 
@@ -308,10 +391,12 @@ def default_config_file_location_does_not_exist(
     return config_file_path
 
 
-@pytest.fixture
-def config_file_with_syntax_error(tmp_path: Path) -> Path:
+@pytest.fixture(scope='session')
+def config_file_with_syntax_error() -> Path:
     r"""An ElSabio config file with syntax errors.
 
+    The static source file is only read by the tests and is therefore not copied.
+
     Returns
     -------
     config_file_path : pathlib.Path
@@ -319,12 +404,9 @@ def config_file_with_syntax_error(tmp_path: Path) -> Path:
     """
 
     source_filename = 'ElSabio_syntax_error.toml'
-    source_config_file_path = STATIC_FILES_CONFIG_BASE_DIR / source_filename
-
-    assert source_config_file_path.exists(), f'File "{source_config_file_path}" does not exist!'
+    config_file_path = STATIC_FILES_CONFIG_BASE_DIR / source_filename
 
-    config_file_path = tmp_path / source_filename
-    config_file_path.write_text(source_config_file_path.read_text())
+    assert config_file_path.exists(), f'File "{config_file_path}" does not exist!'
 
     return config_file_path
 
@@ -334,8 +416,72 @@ def config_file_with_syntax_error(tmp_path: Path) -> Path:
 # =================================================================================================
 
 
+@pytest.fixture(scope='session')
+def empty_sqlite_db_template(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    r"""A SQLite database file with all tables created.
+
+    The schema is created once per test session and the file is copied by `empty_sqlite_db`.
+
+    Returns
+    -------
+    pathlib.Path
+        The path to the database file.
+    """
+
+    path = tmp_path_factory.mktemp('db_template') / 'ElSabio_empty.db'
+    engine = create_engine(url=URL.create('sqlite', database=str(path)))
+    Base.metadata.create_all(bind=engine)
+    engine.dispose()
+
+    return path
+
+
+@pytest.fixture(scope='session')
+def initialized_sqlite_db_template(
+    empty_sqlite_db_template: Path, tmp_path_factory: pytest.TempPathFactory
+) -> Path:
+    r"""A SQLite database file with all default data persisted.
+
+    The database is initialized once per test session and the file is copied
+    by `initialized_sqlite_db`.
+
+    Returns
+    -------
+    pathlib.Path
+        The path to the database file.
+    """
+
+    path = tmp_path_factory.mktemp('db_template') / 'ElSabio_initialized.db'
+    shutil.copyfile(empty_sqlite_db_template, path)
+
+    engine = create_engine(url=URL.create('sqlite', database=str(path)))
+    with sessionmaker(bind=engine)() as session:
+        init(session=session)
+    engine.dispose()
+
+    return path
+
+
 @pytest.fixture
-def empty_sqlite_db(tmp_path: Path) -> tuple[SessionFactory, URL]:
+def sqlite_db_url(tmp_path: Path) -> URL:
+    r"""The url to the SQLite database file of a test.
+
+    The database fixtures copy their template to this file, which is
+    also the database of the test configurations.
+
+    Returns
+    -------
+    db_url : elsabio.db.URL
+        The database connection url.
+    """
+
+    return URL.create('sqlite', database=str(tmp_path / 'ElSabio.db'))
+
+
+@pytest.fixture
+def empty_sqlite_db(
+    empty_sqlite_db_template: Path, sqlite_db_url: URL
+) -> tuple[SessionFactory, URL]:
     r"""An empty SQLite database with all tables created.
 
     Returns
@@ -347,18 +493,14 @@ def empty_sqlite_db(tmp_path: Path) -> tuple[SessionFactory, URL]:
         The database connection url.
     """
 
-    path = tmp_path / 'ElSabio.db'
-    engine = create_engine(url=f'sqlite:///{path}')
-    db_url = make_url(f'sqlite:///{path}')
-    session_factory = sessionmaker(bind=engine)
-    Base.metadata.create_all(bind=engine)
+    shutil.copyfile(empty_sqlite_db_template, cast(str, sqlite_db_url.database))
 
-    return session_factory, db_url
+    return sessionmaker(bind=create_engine(url=sqlite_db_url)), sqlite_db_url
 
 
 @pytest.fixture
 def initialized_sqlite_db(
-    empty_sqlite_db: tuple[SessionFactory, URL],
+    initialized_sqlite_db_template: Path, sqlite_db_url: URL
 ) -> tuple[SessionFactory, URL]:
     r"""An initialized SQLite database with all default data persisted.
 
@@ -371,9 +513,6 @@ def initialized_sqlite_db(
         The database connection url.
     """
 
-    session_factory, db_url = empty_sqlite_db
-
-    with session_factory() as session:
-        init(session=session)
+    shutil.copyfile(initialized_sqlite_db_template, cast(str, sqlite_db_url.database))
 
-    return session_factory, db_url
+    return sessionmaker(bind=create_engine(url=sqlite_db_url)), sqlite_db_url
@@ -7,13 +7,19 @@ r"""Fixtures for testing the Tariff Analyzer command (`ta`) of the ElSabio CLI."
 
 # Standard library
 import re
+import shutil
 from pathlib import Path
+from typing import cast
 from unittest.mock import Mock
 
 # Third party
 import duckdb
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pv
 import pytest
-from sqlalchemy import select
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
 
 # Local
 import elsabio.cli.main
@@ -21,6 +27,7 @@ import elsabio.config.config
 from elsabio.config import BitwardenPasswordlessConfig, ConfigManager, ImportMethod, load_config
 from elsabio.database import URL, SessionFactory
 from elsabio.database.models.tariff_analyzer import Facility, FacilityType, Product
+from elsabio.models.core import BaseDataFrameModel
 from elsabio.models.tariff_analyzer import (
     CustomerGroupDataFrameModel,
     FacilityContractDataFrameModel,
@@ -34,14 +41,43 @@ from elsabio.models.tariff_analyzer import (
     SerieValueImportDataFrameModel,
 )
 from elsabio.models.tariff_analyzer import FacilityTypeEnum as FacilityTypeEnum
-from tests.config import STATIC_FILES_TARIFF_ANALYZER_BASE_DIR
+from tests.config import (
+    CONFIG_PLACEHOLDER_PATTERN,
+    FILENAME_WITH_TIMESTAMP_PATTERN,
+    STATIC_FILES_TARIFF_ANALYZER_BASE_DIR,
+)
 
 # =================================================================================================
 # Models
 # =================================================================================================
 
 
-@pytest.fixture
+def _arrow_to_pandas_dtype(arrow_type: pa.DataType) -> pd.api.extensions.ExtensionDtype:
+    r"""Map an Arrow datatype to the pandas dtype used by the DataFrame models."""
+
+    if pa.types.is_large_string(arrow_type):
+        return pd.StringDtype('pyarrow')
+
+    return pd.ArrowDtype(arrow_type)
+
+
+def read_csv_to_model_df(file: Path, model: type[BaseDataFrameModel]) -> pd.DataFrame:
+    r"""Read a semicolon separated CSV file into a DataFrame with the dtypes of `model`.
+
+    The columns are parsed directly into their Arrow datatypes of
+    :meth:`elsabio.models.core.BaseDataFrameModel.arrow_schema`.
+    """
+
+    table = pv.read_csv(
+        file,
+        parse_options=pv.ParseOptions(delimiter=';'),
+        convert_options=pv.ConvertOptions(column_types=model.arrow_schema()),
+    )
+
+    return table.to_pandas(types_mapper=_arrow_to_pandas_dtype)
+
+
+@pytest.fixture(scope='session')
 def product_model() -> ProductDataFrameModel:
     r"""The full test dataset of product as found when loaded from the database.
 
@@ -56,12 +92,12 @@ def product_model() -> ProductDataFrameModel:
     file = STATIC_FILES_TARIFF_ANALYZER_BASE_DIR / 'product.csv'
     assert file.exists(), f'File "{file}" does not exist!'
 
-    df = duckdb.read_csv(str(file), sep=';').df().astype(ProductDataFrameModel.dtypes)
+    df = read_csv_to_model_df(file=file, model=ProductDataFrameModel)
 
     return ProductDataFrameModel(df=df)
 
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def product_model_to_import(product_model: ProductDataFrameModel) -> ProductImportDataFrameModel:
     r"""The test dataset of the products to import to the database.
 
@@ -71,13 +107,12 @@ def product_model_to_import(product_model: ProductDataFrameModel) -> ProductImpo
         The DataFrame model of the products.
     """
 
-    rel = duckdb.from_df(product_model.df)
-    df = rel.project(f'* EXCLUDE({ProductDataFrameModel.c_product_id})').to_df()
+    df = product_model.df.drop(columns=[ProductDataFrameModel.c_product_id])
 
     return ProductImportDataFrameModel(df=df)
 
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def facilities_model_to_import() -> FacilityImportDataFrameModel:
     r"""The test dataset of the facilities to import to the database.
 
@@ -90,12 +125,12 @@ def facilities_model_to_import() -> FacilityImportDataFrameModel:
     file = STATIC_FILES_TARIFF_ANALYZER_BASE_DIR / 'facility_import.csv'
     assert file.exists(), f'File "{file}" does not exist!'
 
-    df = duckdb.read_csv(str(file), sep=';').df().astype(FacilityImportDataFrameModel.dtypes)
+    df = read_csv_to_model_df(file=file, model=FacilityImportDataFrameModel)
 
     return FacilityImportDataFrameModel(df=df)
 
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def facilities_model() -> FacilityDataFrameModel:
     r"""The full test dataset of facilities as found when loaded from the database.
 
@@ -110,7 +145,7 @@ def facilities_model() -> FacilityDataFrameModel:
     file = STATIC_FILES_TARIFF_ANALYZER_BASE_DIR / 'facility.csv'
     assert file.exists(), f'File "{file}" does not exist!'
 
-    df = duckdb.read_csv(str(file), sep=';').df().astype(FacilityDataFrameModel.dtypes)
+    df = read_csv_to_model_df(file=file, model=FacilityDataFrameModel)
 
     return FacilityDataFrameModel(df=df)
 
@@ -191,7 +226,7 @@ def facility_contract_model(
     return FacilityContractDataFrameModel(df=df)
 
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def active_energy_cons_model() -> SerieValueDataFrameModel:
     r"""The test dataset of the active energy consumption meter data.
 
@@ -216,7 +251,7 @@ def active_energy_cons_model() -> SerieValueDataFrameModel:
     return SerieValueDataFrameModel(df=df)
 
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def active_energy_cons_model_to_import(
     active_energy_cons_model: SerieValueDataFrameModel,
 ) -> SerieValueImportDataFrameModel:
@@ -238,7 +273,7 @@ def active_energy_cons_model_to_import(
     return SerieValueImportDataFrameModel(df=df)
 
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def max_reactive_power_cons_model() -> SerieValueDataFrameModel:
     r"""The test dataset of the max reactive power consumption meter data.
 
@@ -263,7 +298,7 @@ def max_reactive_power_cons_model() -> SerieValueDataFrameModel:
     return SerieValueDataFrameModel(df=df)
 
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def max_reactive_power_cons_model_to_import(
     max_reactive_power_cons_model: SerieValueDataFrameModel,
 ) -> SerieValueImportDataFrameModel:
@@ -342,9 +377,57 @@ def facility_customer_group_link_model() -> FacilityCustomerGroupLinkDataFrameMo
 # =================================================================================================
 
 
+@pytest.fixture(scope='session')
+def sqlite_db_with_2_facilities_template(
+    initialized_sqlite_db_template: Path, tmp_path_factory: pytest.TempPathFactory
+) -> Path:
+    r"""An initialized SQLite database file with 2 facilities persisted.
+
+    The database is created once per test session and the file
+    is copied by `sqlite_db_with_2_facilities`.
+
+    Returns
+    -------
+    pathlib.Path
+        The path to the database file.
+    """
+
+    path = tmp_path_factory.mktemp('db_template') / 'ElSabio_2_facilities.db'
+    shutil.copyfile(initialized_sqlite_db_template, path)
+    engine = create_engine(url=URL.create('sqlite', database=str(path)))
+
+    with sessionmaker(bind=engine)() as session:
+        facility_type_id_cons = session.execute(
+            select(FacilityType.facility_type_id).where(
+                FacilityType.code == FacilityTypeEnum.CONSUMPTION
+            )
+        ).scalar_one()
+
+        facilities = [
+            {
+                'facility_id': 1,
+                'ean': 123456000000000001,
+                'ean_prod': None,
+                'facility_type_id': facility_type_id_cons,
+            },
+            {
+                'facility_id': 2,
+                'ean': 123456000000000002,
+                'ean_prod': 123,
+                'facility_type_id': facility_type_id_cons,
+            },
+        ]
+        session.execute(insert(Facility), facilities)
+        session.commit()
+
+    engine.dispose()
+
+    return path
+
+
 @pytest.fixture
 def sqlite_db_with_2_facilities(
-    initialized_sqlite_db: tuple[SessionFactory, URL],
+    sqlite_db_with_2_facilities_template: Path, sqlite_db_url: URL
 ) -> SessionFactory:
     r"""An ElSabio SQLite database with 2 facilities persisted.
 
@@ -354,26 +437,44 @@ def sqlite_db_with_2_facilities(
         The session factory that can produce new database sessions.
     """
 
-    session_factory, _ = initialized_sqlite_db
+    shutil.copyfile(sqlite_db_with_2_facilities_template, cast(str, sqlite_db_url.database))
 
-    with session_factory() as session:
-        facility_type_cons = session.execute(
-            select(FacilityType).where(FacilityType.code == FacilityTypeEnum.CONSUMPTION)
-        ).scalar_one()
+    return sessionmaker(bind=create_engine(url=sqlite_db_url))
+
+
+@pytest.fixture(scope='session')
+def sqlite_db_with_all_facilities_template(
+    initialized_sqlite_db_template: Path,
+    facilities_model: FacilityDataFrameModel,
+    tmp_path_factory: pytest.TempPathFactory,
+) -> Path:
+    r"""An initialized SQLite database file with all test facilities persisted.
+
+    The database is created once per test session and the file
+    is copied by `sqlite_db_with_all_facilities`.
+
+    Returns
+    -------
+    pathlib.Path
+        The path to the database file.
+    """
 
-        f1 = Facility(facility_id=1, ean=123456000000000001, facility_type=facility_type_cons)
-        f2 = Facility(
-            facility_id=2, ean=123456000000000002, ean_prod=123, facility_type=facility_type_cons
-        )
-        session.add_all((f1, f2))
+    path = tmp_path_factory.mktemp('db_template') / 'ElSabio_all_facilities.db'
+    shutil.copyfile(initialized_sqlite_db_template, path)
+    engine = create_engine(url=URL.create('sqlite', database=str(path)))
+
+    with sessionmaker(bind=engine)() as session:
+        session.execute(insert(Facility), facilities_model.df.to_dict(orient='records'))
         session.commit()
 
-    return session_factory
+    engine.dispose()
+
+    return path
 
 
 @pytest.fixture
 def sqlite_db_with_all_facilities(
-    initialized_sqlite_db: tuple[SessionFactory, URL], facilities_model: FacilityDataFrameModel
+    sqlite_db_with_all_facilities_template: Path, sqlite_db_url: URL
 ) -> SessionFactory:
     r"""An ElSabio SQLite database with all test facilities persisted.
 
@@ -383,14 +484,9 @@ def sqlite_db_with_all_facilities(
         The session factory that can produce new database sessions.
     """
 
-    session_factory, _ = initialized_sqlite_db
+    shutil.copyfile(sqlite_db_with_all_facilities_template, cast(str, sqlite_db_url.database))
 
-    with session_factory() as session:
-        facilities_model.df.to_sql(
-            name=Facility.__tablename__, con=session.get_bind(), if_exists='append', index=False
-        )
-
-    return session_factory
+    return sessionmaker(bind=create_engine(url=sqlite_db_url))
 
 
 @pytest.fixture
@@ -410,20 +506,38 @@ def sqlite_db_with_products_and_facilities(
     session_factory, _ = initialized_sqlite_db
 
     with session_factory() as session:
-        conn = session.get_bind()
-        product_model.df.to_sql(
-            name=Product.__tablename__, con=conn, if_exists='append', index=False
-        )
-        facilities_model.df.to_sql(
-            name=Facility.__tablename__, con=conn, if_exists='append', index=False
-        )
+        session.execute(insert(Product), product_model.df.to_dict(orient='records'))
+        session.execute(insert(Facility), facilities_model.df.to_dict(orient='records'))
+        session.commit()
 
     return session_factory
 
 
+@pytest.fixture(scope='session')
+def config_data_import_method_file_source() -> str:
+    r"""The source of an ElSabio Tariff Analyzer configuration with file based data imports.
+
+    The source file is read once per test session.
+
+    Returns
+    -------
+    str
+        The configuration as a string of toml with placeholders for the paths.
+    """
+
+    source_filename = 'config_tariff_analyzer_import_method_file.toml'
+    source_config_file_path = STATIC_FILES_TARIFF_ANALYZER_BASE_DIR / source_filename
+
+    assert source_config_file_path.exists(), f'File "{source_config_file_path}" does not exist!'
+
+    return source_config_file_path.read_text()
+
+
 @pytest.fixture
 def config_data_import_method_file(
-    tmp_path: Path, empty_sqlite_db: tuple[URL, SessionFactory]
+    config_data_import_method_file_source: str,
+    tmp_path: Path,
+    sqlite_db_url: URL,
 ) -> tuple[str, ConfigManager]:
     r"""An ElSabio Tariff Analyzer configuration with file based data imports.
 
@@ -436,15 +550,6 @@ def config_data_import_method_file(
         The expected configuration after loading and parsing `config_data_str`.
     """
 
-    source_filename = 'config_tariff_analyzer_import_method_file.toml'
-    source_config_file_path = STATIC_FILES_TARIFF_ANALYZER_BASE_DIR / source_filename
-
-    assert source_config_file_path.exists(), f'File "{source_config_file_path}" does not exist!'
-
-    config_data_str = source_config_file_path.read_text()
-
-    _, db_url = empty_sqlite_db
-
     data_dir = tmp_path / 'data'
     data_dir.mkdir()
 
@@ -463,17 +568,20 @@ def config_data_import_method_file(
     max_reactive_power_cons_input_path = tmp_path / 'max_reactive_power_cons'
     max_reactive_power_cons_input_path.mkdir()
 
-    config_data_str = (
-        config_data_str.replace(':db_url', str(db_url))
-        .replace(':ta_data_dir', str(data_dir))
-        .replace(':product_data_path', str(product_input_path))
-        .replace(':facility_data_path', str(facility_input_path))
-        .replace(':facility_contract_data_path', str(facility_contract_input_path))
-        .replace(':active_energy_cons_data_path', str(active_energy_cons_input_path))
-        .replace(':max_reactive_power_cons_data_path', str(max_reactive_power_cons_input_path))
+    placeholders = {
+        ':db_url': str(sqlite_db_url),
+        ':ta_data_dir': str(data_dir),
+        ':product_data_path': str(product_input_path),
+        ':facility_data_path': str(facility_input_path),
+        ':facility_contract_data_path': str(facility_contract_input_path),
+        ':active_energy_cons_data_path': str(active_energy_cons_input_path),
+        ':max_reactive_power_cons_data_path': str(max_reactive_power_cons_input_path),
+    }
+    config_data_str = CONFIG_PLACEHOLDER_PATTERN.sub(
+        lambda m: placeholders[m[0]], config_data_import_method_file_source
     )
 
-    database_config = {'url': db_url, 'create_database': True}
+    database_config = {'url': sqlite_db_url, 'create_database': True}
 
     bwp_config = {'public_key': 'bwp_public_key', 'private_key': 'bwp_private_key'}
 
@@ -564,7 +672,7 @@ def mocked_load_config_with_no_import_data(
     return m, cm
 
 
-@pytest.fixture(scope='module')
+@pytest.fixture(scope='session')
 def filename_with_timestamp_pattern_regex() -> re.Pattern:
     r"""The regex for matching a filename with a timestamp prepended.
 
@@ -577,4 +685,4 @@ def filename_with_timestamp_pattern_regex() -> re.Pattern:
         The regex pattern.
     """
 
-    return re.compile(r'^\d{4}-\d{2}-\d{2}T\d{2}\.\d{2}\.\d{2}[+-]\d{4}_[\w\.]*$')
+    return FILENAME_WITH_TIMESTAMP_PATTERN
@@ -322,6 +322,7 @@ def load_facility_customer_group_links(session: Session) -> pd.DataFrame:
 
 
 @pytest.mark.usefixtures('mocked_load_config')
+@pytest.mark.slow
 class TestCustomerGroupMapFacilitiesCommand:
     r"""Tests for CLI command `elsabio ta cg map-facilities`."""
 
@@ -8,6 +8,7 @@ r"""Unit tests for the module cli.tariff_analyzer.import_.facility."""
 # Standard library
 import re
 from pathlib import Path
+from typing import ClassVar
 
 # Third party
 import pandas as pd
@@ -18,19 +19,39 @@ from sqlalchemy import select
 
 # Local
 from elsabio.cli.main import main
+from elsabio.cli.tariff_analyzer.import_.facility import _upsert_facilities
 from elsabio.config import ConfigManager
 from elsabio.config.tariff_analyzer import DataSource
+from elsabio.database import SessionFactory
 from elsabio.database.models.tariff_analyzer import Facility
 from elsabio.models.tariff_analyzer import FacilityDataFrameModel, FacilityImportDataFrameModel
+from elsabio.operations.core import UpsertDataFrames
 
 # =================================================================================================
 # Fixtures
 # =================================================================================================
 
 
+@pytest.fixture(scope='module')
+def facility_import_parquet_bytes(
+    facilities_model_to_import: FacilityImportDataFrameModel,
+) -> bytes:
+    r"""The facility test input data encoded as parquet.
+
+    The data is only encoded once per module and written to a file by the tests.
+
+    Returns
+    -------
+    bytes
+        The content of a parquet file.
+    """
+
+    return facilities_model_to_import.df.to_parquet(compression=None)
+
+
 @pytest.fixture
 def facility_import_parquet_file(
-    facilities_model_to_import: FacilityImportDataFrameModel,
+    facility_import_parquet_bytes: bytes,
     config_data_import_method_file: tuple[str, ConfigManager],
 ) -> Path:
     r"""Write the facility test input data parquet file.
@@ -48,7 +69,7 @@ def facility_import_parquet_file(
     assert facility_data is not None, 'Missing configuration "tariff_analyzer.data.facility"!'
 
     file = facility_data.path / 'facilities.parquet'
-    facilities_model_to_import.df.to_parquet(path=file)
+    file.write_bytes(facility_import_parquet_bytes)
 
     return file
 
@@ -86,7 +107,7 @@ def facility_import_parquet_file_missing_values_in_required_columns(
     ean_codes = tuple(str(df.loc[v, c_ean]) for v in range(1, 4))
 
     file = data.path / 'facilities.parquet'
-    df.to_parquet(path=file)
+    df.to_parquet(path=file, compression=None)
 
     return file, ean_codes
 
@@ -122,7 +143,7 @@ def facility_import_parquet_file_with_duplicate_ean_rows(
     ean_codes = (str(df.loc[6, c_ean]),)
 
     file = data.path / 'facilities.parquet'
-    df.to_parquet(path=file)
+    df.to_parquet(path=file, compression=None)
 
     return file, ean_codes
 
@@ -161,7 +182,7 @@ def facility_import_parquet_file_with_duplicate_ean_prod_rows(
     ean_codes = (str(df.loc[2, c_ean_prod]), str(df.loc[5, c_ean_prod]))
 
     file = data.path / 'facilities.parquet'
-    df.to_parquet(path=file)
+    df.to_parquet(path=file, compression=None)
 
     return file, ean_codes
 
@@ -193,13 +214,15 @@ def facility_import_parquet_file_invalid_facility_type(
     c_facility_type_code = FacilityImportDataFrameModel.c_facility_type_code
     c_ean = FacilityImportDataFrameModel.c_ean
 
-    df = facilities_model_to_import.df.copy()
-    df.loc[1, c_facility_type_code] = 'test'
-    df.loc[3, c_facility_type_code] = 'invalid'
-    ean_codes = (str(df.loc[1, c_ean]), str(df.loc[3, c_ean]))
+    df_source = facilities_model_to_import.df
+    facility_type_codes = df_source[c_facility_type_code].copy()
+    facility_type_codes.loc[1] = 'test'
+    facility_type_codes.loc[3] = 'invalid'
+    df = df_source.assign(**{c_facility_type_code: facility_type_codes})
+    ean_codes = (str(df_source.loc[1, c_ean]), str(df_source.loc[3, c_ean]))
 
     file = facility_data.path / 'facilities.parquet'
-    df.to_parquet(path=file)
+    df.to_parquet(path=file, compression=None)
 
     return file, ean_codes
 
@@ -225,7 +248,7 @@ def empty_facility_import_parquet_file(
     df = pd.DataFrame()
 
     file = facility_data.path / 'facilities.parquet'
-    df.to_parquet(path=file)
+    df.to_parquet(path=file, compression=None)
 
     return file
 
@@ -235,9 +258,12 @@ def empty_facility_import_parquet_file(
 # =================================================================================================
 
 
+@pytest.mark.slow
 class TestTariffAnalyzerImportFacilityCommand:
     r"""Tests for CLI command `ta import facility`."""
 
+    runner: ClassVar[CliRunner] = CliRunner()
+
     @pytest.mark.usefixtures(
         'default_config_file_location_does_not_exist',
         'config_import_method_file_in_config_file_env_var',
@@ -288,12 +314,11 @@ class TestTariffAnalyzerImportFacilityCommand:
         else:
             session_factory = db
 
-        runner = CliRunner()
         args = ['ta', 'import', 'facility']
 
         # Exercise
         # ===========================================================
-        result = runner.invoke(cli=main, args=args, catch_exceptions=False)
+        result = self.runner.invoke(cli=main, args=args, catch_exceptions=False)
 
         # Verify
         # ===========================================================
@@ -305,12 +330,10 @@ class TestTariffAnalyzerImportFacilityCommand:
         query = select(Facility).order_by(Facility.ean.asc())
 
         with session_factory() as session:
-            df_facility = pd.read_sql(
-                sql=query,
-                con=session.get_bind(),
-                dtype_backend='pyarrow',
-                dtype=FacilityDataFrameModel.dtypes,
-            )
+            result_facility = session.connection().execute(query)
+            df_facility = pd.DataFrame(
+                data=result_facility.all(), columns=list(result_facility.keys()), dtype=object
+            ).astype(FacilityDataFrameModel.dtypes)
 
         assert_frame_equal(df_facility, facilities_model.df)
 
@@ -322,13 +345,13 @@ class TestTariffAnalyzerImportFacilityCommand:
         assert len(target_files) == 1, 'Incorrect nr of items in target directory!'
 
         target_file = target_files[0]
-        assert filename_with_timestamp_pattern_regex.match(target_file.name) is not None, (
+        assert filename_with_timestamp_pattern_regex.fullmatch(target_file.name) is not None, (
             'Filename of moved file is incorrect!'
         )
 
         df_import = pd.read_parquet(target_file)
 
-        assert_frame_equal(df_import, facilities_model_to_import.df, check_dtype=False)
+        assert_frame_equal(df_import, facilities_model_to_import.df)
 
         # Clean up - None
         # ===========================================================
@@ -341,12 +364,11 @@ class TestTariffAnalyzerImportFacilityCommand:
         # ===========================================================
         message_exp = f'No configuration found for "tariff_analyzer.data.{DataSource.FACILITY}"!\n'
 
-        runner = CliRunner()
         args = ['ta', 'import', 'facility']
 
         # Exercise
         # ===========================================================
-        result = runner.invoke(cli=main, args=args, catch_exceptions=False)
+        result = self.runner.invoke(cli=main, args=args, catch_exceptions=False)
 
         # Verify
         # ===========================================================
@@ -376,12 +398,11 @@ class TestTariffAnalyzerImportFacilityCommand:
 
         pattern_exp = f'{cfg.path}/*.parquet'
 
-        runner = CliRunner()
         args = ['ta', 'import', 'facility']
 
         # Exercise
         # ===========================================================
-        result = runner.invoke(cli=main, args=args, catch_exceptions=False)
+        result = self.runner.invoke(cli=main, args=args, catch_exceptions=False)
 
         # Verify
         # ===========================================================
@@ -414,12 +435,11 @@ class TestTariffAnalyzerImportFacilityCommand:
         )
         message_exp = f'Found rows ({len(eans_exp)}) with missing values in required columns'
 
-        runner = CliRunner()
         args = ['ta', 'import', 'facility']
 
         # Exercise
         # ===========================================================
-        result = runner.invoke(cli=main, args=args, catch_exceptions=False)
+        result = self.runner.invoke(cli=main, args=args, catch_exceptions=False)
 
         # Verify
         # ===========================================================
@@ -474,12 +494,11 @@ class TestTariffAnalyzerImportFacilityCommand:
         _, eans_exp = request.getfixturevalue(fixture_func)
         message_exp = f'Found duplicate rows ({nr_duplicates}) over columns:'
 
-        runner = CliRunner()
         args = ['ta', 'import', 'facility']
 
         # Exercise
         # ===========================================================
-        result = runner.invoke(cli=main, args=args, catch_exceptions=False)
+        result = self.runner.invoke(cli=main, args=args, catch_exceptions=False)
 
         # Verify
         # ===========================================================
@@ -518,12 +537,11 @@ class TestTariffAnalyzerImportFacilityCommand:
             f'for column "{FacilityImportDataFrameModel.c_facility_type_code}"!'
         )
 
-        runner = CliRunner()
         args = ['ta', 'import', 'facility']
 
         # Exercise
         # ===========================================================
-        result = runner.invoke(cli=main, args=args, catch_exceptions=False)
+        result = self.runner.invoke(cli=main, args=args, catch_exceptions=False)
 
         # Verify
         # ===========================================================
@@ -548,12 +566,11 @@ class TestTariffAnalyzerImportFacilityCommand:
 
         # Setup
         # ===========================================================
-        runner = CliRunner()
         args = ['ta', 'import', 'facility']
 
         # Exercise
         # ===========================================================
-        result = runner.invoke(cli=main, args=args, catch_exceptions=False)
+        result = self.runner.invoke(cli=main, args=args, catch_exceptions=False)
 
         # Verify
         # ===========================================================
@@ -566,3 +583,71 @@ class TestTariffAnalyzerImportFacilityCommand:
 
         # Clean up - None
         # ===========================================================
+
+
+class TestUpsertFacilities:
+    r"""Tests for the function `_upsert_facilities`."""
+
+    def test_failing_chunk_rolls_back_all_chunks(
+        self, sqlite_db_with_2_facilities: SessionFactory
+    ) -> None:
+        r"""Test that no facilities are saved if a chunk after the first one fails.
+
+        The second chunk inserts a facility with the `ean` of an existing facility,
+        which violates the unique constraint of the column.
+        """
+
+        # Setup
+        # ===========================================================
+        session_factory = sqlite_db_with_2_facilities
+        c_facility_id = FacilityDataFrameModel.c_facility_id
+        c_ean = FacilityDataFrameModel.c_ean
+        c_facility_type_id = FacilityDataFrameModel.c_facility_type_id
+        c_name = FacilityDataFrameModel.c_name
+
+        query = select(Facility.facility_id, Facility.ean, Facility.name).order_by(
+            Facility.facility_id
+        )
+
+        with session_factory() as session:
+            facilities_exp = session.execute(query).all()
+            facility_type_id = session.execute(select(Facility.facility_type_id)).scalars().first()
+
+        chunks = iter(
+            [
+                UpsertDataFrames(
+                    insert=pd.DataFrame(
+                        {c_ean: [123456000000000003], c_facility_type_id: [facility_type_id]}
+                    ),
+                    update=pd.DataFrame({c_facility_id: [1], c_name: ['Updated']}),
+                    invalid=pd.DataFrame(),
+                ),
+                UpsertDataFrames(
+                    insert=pd.DataFrame(
+                        {c_ean: [123456000000000002], c_facility_type_id: [facility_type_id]}
+                    ),
+                    update=pd.DataFrame(columns=[c_facility_id]),
+                    invalid=pd.DataFrame(),
+                ),
+            ]
+        )
+
+        # Exercise
+        # ===========================================================
+        with session_factory() as session:
+            nr_inserted, nr_updated, result = _upsert_facilities(session=session, chunks=chunks)
+
+        # Verify
+        # ===========================================================
+        print(result.short_msg)
+
+        assert result.ok is False, 'result.ok is not False!'
+        assert (nr_inserted, nr_updated) == (0, 0), 'Incorrect nr of inserted and updated rows!'
+
+        with session_factory() as session:
+            facilities = session.execute(query).all()
+
+        assert facilities == facilities_exp, 'Facilities of the first chunk were saved!'
+
+        # Clean up - None
+        # ===========================================================
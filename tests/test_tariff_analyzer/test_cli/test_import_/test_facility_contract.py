@@ -146,7 +146,7 @@ def facility_contract_import_parquet_file(
     )
 
     file = facility_contract_data.path / 'facility_contracts.parquet'
-    facility_contract_model_to_import.df.to_parquet(path=file)
+    facility_contract_model_to_import.df.to_parquet(path=file, compression=None)
 
     return file
 
@@ -184,7 +184,7 @@ def facility_contract_parquet_file_with_unknown_facility(
     df.loc[3, c_ean] = 1234560000000000039
     ean_code = str(df.loc[3, c_ean])
 
-    df.to_parquet(path=file)
+    df.to_parquet(path=file, compression=None)
 
     return file, ean_code
 
@@ -219,7 +219,7 @@ def facility_contract_parquet_file_missing_required_columns(
     )
 
     file = product_data.path / 'facility_contracts.parquet'
-    df.to_parquet(path=file)
+    df.to_parquet(path=file, compression=None)
 
     return file
 
@@ -261,7 +261,7 @@ def facility_contract_parquet_file_missing_values_in_required_columns(
     ean_codes = tuple(str(df.loc[i, c_ean]) for i in range(3, 6))
 
     file = facility_data.path / 'facility_contracts.parquet'
-    df.to_parquet(path=file)
+    df.to_parquet(path=file, compression=None)
 
     return file, ean_codes
 
@@ -301,7 +301,7 @@ def facility_contract_parquet_file_with_duplicate_rows(
     ean_code = str(df.loc[3, c_ean])
 
     file = data.path / 'facility_contracts.parquet'
-    df.to_parquet(path=file)
+    df.to_parquet(path=file, compression=None)
 
     return file, ean_code
 
@@ -338,7 +338,7 @@ def facility_contract_parquet_file_invalid_customer_type_code(
     ean_codes = (str(df.loc[2, c_ean]), str(df.loc[4, c_ean]))
 
     file = facility_data.path / 'facility_contracts.parquet'
-    df.to_parquet(path=file)
+    df.to_parquet(path=file, compression=None)
 
     return file, ean_codes
 
@@ -375,7 +375,7 @@ def facility_contract_parquet_file_date_id_not_at_month_start(
     ean_codes = (str(df.loc[3, c_ean]), str(df.loc[5, c_ean]))
 
     file = facility_data.path / 'facility_contracts.parquet'
-    df.to_parquet(path=file)
+    df.to_parquet(path=file, compression=None)
 
     return file, ean_codes
 
@@ -402,7 +402,7 @@ def empty_facility_contract_import_parquet_file(
     df = pd.DataFrame()
 
     file = product_data.path / 'facility_contracts.parquet'
-    df.to_parquet(path=file)
+    df.to_parquet(path=file, compression=None)
 
     return file
 
@@ -412,6 +412,7 @@ def empty_facility_contract_import_parquet_file(
 # =================================================================================================
 
 
+@pytest.mark.slow
 class TestTariffAnalyzerImportFacilityContractCommand:
     r"""Tests for CLI command `ta import facility-contract`."""
 
@@ -506,13 +507,13 @@ class TestTariffAnalyzerImportFacilityContractCommand:
         assert len(target_files) == 1, 'Incorrect nr of items in target directory!'
 
         target_file = target_files[0]
-        assert filename_with_timestamp_pattern_regex.match(target_file.name) is not None, (
+        assert filename_with_timestamp_pattern_regex.fullmatch(target_file.name) is not None, (
             'Filename of moved file is incorrect!'
         )
 
         df_import = pd.read_parquet(target_file)
 
-        assert_frame_equal(df_import, facility_contract_model_to_import.df, check_dtype=False)
+        assert_frame_equal(df_import, facility_contract_model_to_import.df)
 
         # Clean up - None
         # ===========================================================
@@ -6,14 +6,20 @@
 r"""Unit tests for the module cli.tariff_analyzer.import_.meter_data."""
 
 # Standard library
+import operator
 import re
+import shutil
+from collections.abc import Mapping, Sequence
 from datetime import date
+from functools import reduce
 from pathlib import Path
 from typing import ClassVar
 
 # Third party
-import duckdb
 import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
 import pytest
 from click.testing import CliRunner
 from pandas.testing import assert_frame_equal
@@ -30,9 +36,74 @@ from elsabio.models.tariff_analyzer import SerieValueDataFrameModel, SerieValueI
 # =================================================================================================
 
 
+def _write_active_energy_cons_parquet_file(df: pd.DataFrame, cm: ConfigManager) -> Path:
+    r"""Write an active energy consumption parquet file to the input directory of `cm`.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        The data to write.
+
+    cm : elsabio.config.ConfigManager
+        The configuration with the data source `tariff_analyzer.data.active_energy_cons`.
+
+    Returns
+    -------
+    file : pathlib.Path
+        The full path to the parquet file.
+    """
+
+    data = cm.tariff_analyzer.data.get(DataSource.ACTIVE_ENERGY_CONS)
+
+    assert data is not None, 'Missing configuration "tariff_analyzer.data.active_energy_cons"!'
+
+    file = data.path / 'active_energy_cons.parquet'
+    df.to_parquet(path=file, compression=None)
+
+    return file
+
+
+@pytest.fixture(scope='session')
+def active_energy_cons_import_parquet_file_cached(
+    active_energy_cons_model_to_import: SerieValueImportDataFrameModel,
+    tmp_path_factory: pytest.TempPathFactory,
+) -> Path:
+    r"""The active energy consumption data to import written once per test session.
+
+    Returns
+    -------
+    file : pathlib.Path
+        The full path to the parquet file to copy into the input directory of a test.
+    """
+
+    file = tmp_path_factory.mktemp('parquet_cache') / 'active_energy_cons.parquet'
+    active_energy_cons_model_to_import.df.to_parquet(path=file, compression=None)
+
+    return file
+
+
+@pytest.fixture(scope='session')
+def max_reactive_power_cons_import_parquet_file_cached(
+    max_reactive_power_cons_model_to_import: SerieValueImportDataFrameModel,
+    tmp_path_factory: pytest.TempPathFactory,
+) -> Path:
+    r"""The max reactive power consumption data to import written once per test session.
+
+    Returns
+    -------
+    file : pathlib.Path
+        The full path to the parquet file to copy into the input directory of a test.
+    """
+
+    file = tmp_path_factory.mktemp('parquet_cache') / 'max_reactive_power_cons.parquet'
+    max_reactive_power_cons_model_to_import.df.to_parquet(path=file, compression=None)
+
+    return file
+
+
 @pytest.fixture
 def active_energy_cons_import_parquet_file(
-    active_energy_cons_model_to_import: SerieValueDataFrameModel,
+    active_energy_cons_import_parquet_file_cached: Path,
     config_data_import_method_file: tuple[str, ConfigManager],
 ) -> Path:
     r"""A parquet file with the active energy consumption data to import.
@@ -49,14 +120,14 @@ def active_energy_cons_import_parquet_file(
     assert data is not None, 'Missing configuration "tariff_analyzer.data.active_energy_cons"!'
 
     file = data.path / 'active_energy_cons.parquet'
-    active_energy_cons_model_to_import.df.to_parquet(path=file)
+    shutil.copyfile(active_energy_cons_import_parquet_file_cached, file)
 
     return file
 
 
 @pytest.fixture
 def max_reactive_power_cons_import_parquet_file(
-    max_reactive_power_cons_model_to_import: SerieValueDataFrameModel,
+    max_reactive_power_cons_import_parquet_file_cached: Path,
     config_data_import_method_file: tuple[str, ConfigManager],
 ) -> Path:
     r"""A parquet file with the max reactive power consumption data to import.
@@ -73,7 +144,7 @@ def max_reactive_power_cons_import_parquet_file(
     assert data is not None, 'Missing configuration "tariff_analyzer.data.max_reactive_power_cons"!'
 
     file = data.path / 'max_reactive_power_cons.parquet'
-    max_reactive_power_cons_model_to_import.df.to_parquet(path=file)
+    shutil.copyfile(max_reactive_power_cons_import_parquet_file_cached, file)
 
     return file
 
@@ -94,9 +165,6 @@ def active_energy_cons_parquet_file_missing_required_columns(
     """
 
     _, cm = config_data_import_method_file
-    data = cm.tariff_analyzer.data.get(DataSource.ACTIVE_ENERGY_CONS)
-
-    assert data is not None, 'Missing configuration "tariff_analyzer.data.active_energy_cons"!'
 
     df = active_energy_cons_model_to_import.df.copy().drop(
         columns=[
@@ -105,10 +173,7 @@ def active_energy_cons_parquet_file_missing_required_columns(
         ]
     )
 
-    file = data.path / 'active_energy_cons.parquet'
-    df.to_parquet(path=file)
-
-    return file
+    return _write_active_energy_cons_parquet_file(df=df, cm=cm)
 
 
 @pytest.fixture
@@ -131,9 +196,6 @@ def active_energy_cons_parquet_file_missing_values_in_required_columns(
     """
 
     _, cm = config_data_import_method_file
-    data = cm.tariff_analyzer.data.get(DataSource.ACTIVE_ENERGY_CONS)
-
-    assert data is not None, 'Missing configuration for "tariff_analyzer.data.active_energy_cons"!'
 
     c_serie_type_code = SerieValueImportDataFrameModel.c_serie_type_code
     c_ean = SerieValueImportDataFrameModel.c_ean
@@ -147,8 +209,7 @@ def active_energy_cons_parquet_file_missing_values_in_required_columns(
     df.loc[4, c_serie_value] = None
     ean_codes = tuple(str(df.loc[v, c_ean]) for v in range(1, 5))
 
-    file = data.path / 'active_energy_cons.parquet'
-    df.to_parquet(path=file)
+    file = _write_active_energy_cons_parquet_file(df=df, cm=cm)
 
     return file, ean_codes
 
@@ -172,9 +233,6 @@ def active_energy_cons_parquet_file_with_duplicate_rows(
     """
 
     _, cm = config_data_import_method_file
-    data = cm.tariff_analyzer.data.get(DataSource.ACTIVE_ENERGY_CONS)
-
-    assert data is not None, 'Missing configuration for "tariff_analyzer.data.active_energy_cons"!'
 
     c_serie_type_code = SerieValueImportDataFrameModel.c_serie_type_code
     c_ean = SerieValueImportDataFrameModel.c_ean
@@ -188,8 +246,7 @@ def active_energy_cons_parquet_file_with_duplicate_rows(
     df.loc[duplicate_row, c_serie_value] = 89
     ean_code = str(df.loc[7, c_ean])
 
-    file = data.path / 'active_energy_cons.parquet'
-    df.to_parquet(path=file)
+    file = _write_active_energy_cons_parquet_file(df=df, cm=cm)
 
     return file, ean_code
 
@@ -213,9 +270,6 @@ def active_energy_cons_parquet_file_invalid_serie_type_code_and_ean(
     """
 
     _, cm = config_data_import_method_file
-    data = cm.tariff_analyzer.data.get(DataSource.ACTIVE_ENERGY_CONS)
-
-    assert data is not None, 'Missing configuration for "tariff_analyzer.data.active_energy_cons"!'
 
     c_ean = SerieValueImportDataFrameModel.c_ean
     c_serie_type_code = SerieValueDataFrameModel.c_serie_type_code
@@ -225,8 +279,7 @@ def active_energy_cons_parquet_file_invalid_serie_type_code_and_ean(
     df.loc[4, c_serie_type_code] = 'test'
     ean_codes = (str(df.loc[2, c_ean]), str(df.loc[4, c_ean]))
 
-    file = data.path / 'active_energy_cons.parquet'
-    df.to_parquet(path=file)
+    file = _write_active_energy_cons_parquet_file(df=df, cm=cm)
 
     return file, ean_codes
 
@@ -248,9 +301,6 @@ def active_energy_cons_parquet_file_date_id_not_at_month_start(
     """
 
     _, cm = config_data_import_method_file
-    data = cm.tariff_analyzer.data.get(DataSource.ACTIVE_ENERGY_CONS)
-
-    assert data is not None, 'Missing configuration for "tariff_analyzer.data.active_energy_cons"!'
 
     c_ean = SerieValueImportDataFrameModel.c_ean
     c_date_id = SerieValueImportDataFrameModel.c_date_id
@@ -260,8 +310,7 @@ def active_energy_cons_parquet_file_date_id_not_at_month_start(
     df.loc[5, c_date_id] = date(2025, 12, 20)
     ean_codes = (str(df.loc[3, c_ean]), str(df.loc[5, c_ean]))
 
-    file = data.path / 'active_energy_cons.parquet'
-    df.to_parquet(path=file)
+    file = _write_active_energy_cons_parquet_file(df=df, cm=cm)
 
     return file, ean_codes
 
@@ -279,16 +328,8 @@ def empty_active_energy_cons_import_parquet_file(
     """
 
     _, cm = config_data_import_method_file
-    data = cm.tariff_analyzer.data.get(DataSource.ACTIVE_ENERGY_CONS)
-
-    assert data is not None, 'Missing configuration "tariff_analyzer.data.active_energy_cons"!'
 
-    df = pd.DataFrame()
-
-    file = data.path / 'active_energy_cons.parquet'
-    df.to_parquet(path=file)
-
-    return file
+    return _write_active_energy_cons_parquet_file(df=pd.DataFrame(), cm=cm)
 
 
 # =================================================================================================
@@ -296,25 +337,65 @@ def empty_active_energy_cons_import_parquet_file(
 # =================================================================================================
 
 
+@pytest.mark.slow
 class TestTariffAnalyzerImportFacilityContractCommand:
     r"""Tests for the CLI command `ta import meter-data`."""
 
-    sort_values_by: ClassVar[list[str]] = [
+    runner: ClassVar[CliRunner] = CliRunner()
+
+    sort_values_by: ClassVar[tuple[str, ...]] = (
+        SerieValueDataFrameModel.c_serie_type_code,
         SerieValueDataFrameModel.c_facility_id,
         SerieValueDataFrameModel.c_date_id,
-    ]
+    )
+
+    partitioning: ClassVar[ds.Partitioning] = ds.partitioning(
+        schema=pa.schema(
+            [
+                (SerieValueDataFrameModel.c_serie_type_code, pa.string()),
+                (SerieValueDataFrameModel.c_date_id, pa.date32()),
+            ]
+        ),
+        flavor='hive',
+    )
 
-    def load_imported_meter_data(self, path: Path) -> pd.DataFrame:
-        r"""Helper method to load imported meter data from parquet files."""
+    def load_imported_meter_data(
+        self, path: Path, partitions: Mapping[str, Sequence[date]]
+    ) -> pd.DataFrame:
+        r"""Helper method to load imported meter data from parquet files.
+
+        The meter data of all `partitions` is loaded in a single scan and
+        only the matching partition directories are read. The rows are
+        sorted by :attr:`sort_values_by`.
+
+        Parameters
+        ----------
+        path : pathlib.Path
+            The root directory of the meter data parquet hive.
+
+        partitions : Mapping[str, Sequence[datetime.date]]
+            The dates of the meter data to load for each serie type.
+        """
+
+        c_serie_type_code = SerieValueDataFrameModel.c_serie_type_code
+        c_date_id = SerieValueDataFrameModel.c_date_id
+
+        expr = reduce(
+            operator.or_,
+            (
+                (ds.field(c_serie_type_code) == serie_type_code)
+                & ds.field(c_date_id).isin(date_ids)
+                for serie_type_code, date_ids in partitions.items()
+            ),
+        )
+
+        dataset = ds.dataset(source=path, format='parquet', partitioning=self.partitioning)
 
         return (
-            duckdb.read_parquet(
-                file_glob=f'{path}/*.parquet',
-                hive_partitioning=True,
-            )
-            .to_df(date_as_object=True)
+            dataset.to_table(filter=expr)
+            .sort_by([(c, 'ascending') for c in self.sort_values_by])
+            .to_pandas(date_as_object=True)
             .astype(SerieValueDataFrameModel.dtypes)
-            .sort_values(self.sort_values_by)
         )
 
     @pytest.mark.usefixtures(
@@ -351,31 +432,22 @@ class TestTariffAnalyzerImportFacilityContractCommand:
         )
         dfs_imported_exp = (active_energy_cons_model.df, max_reactive_power_cons_model.df)
 
-        c_serie_type_code = SerieValueDataFrameModel.c_serie_type_code
-        c_date_id = SerieValueDataFrameModel.c_date_id
-
         meter_data_dir = cm.tariff_analyzer.data_dir / 'meter_data'
-        active_energy_cons_dir = (
-            meter_data_dir
-            / f'{c_serie_type_code}={SerieTypeEnum.ACTIVE_ENERGY_CONS}'
-            / f'{c_date_id}=2025-11-01'
-        )
-        max_reactive_power_cons_dir = (
-            meter_data_dir / f'{c_serie_type_code}={SerieTypeEnum.MAX_REACTIVE_POWER_CONS}' / '*'
-        )
-        imported_dirs_exp = (active_energy_cons_dir, max_reactive_power_cons_dir)
+        imported_partitions_exp = {
+            SerieTypeEnum.ACTIVE_ENERGY_CONS: (date(2025, 11, 1),),
+            SerieTypeEnum.MAX_REACTIVE_POWER_CONS: (date(2025, 11, 1), date(2025, 12, 1)),
+        }
 
         message_exp = (
             f'Successfully processed meter data for sources: '
             f"('{DataSource.ACTIVE_ENERGY_CONS}', '{DataSource.MAX_REACTIVE_POWER_CONS}')"
         )
 
-        runner = CliRunner()
         args = ['ta', 'import', 'meter-data']
 
         # Exercise
         # ===========================================================
-        result = runner.invoke(cli=main, args=args, catch_exceptions=False)
+        result = self.runner.invoke(cli=main, args=args, catch_exceptions=False)
 
         # Verify
         # ===========================================================
@@ -384,17 +456,21 @@ class TestTariffAnalyzerImportFacilityContractCommand:
         assert result.exit_code == 0, 'Exit code is not 0!'
         assert message_exp in result.output, 'Expected message missing in terminal output!'
 
-        for i in range(0, 2):
-            df_imported = self.load_imported_meter_data(path=imported_dirs_exp[i])
-            df_exp = dfs_imported_exp[i].sort_values(self.sort_values_by)
+        df_imported = self.load_imported_meter_data(
+            path=meter_data_dir, partitions=imported_partitions_exp
+        )
+        df_exp = pd.concat(dfs_imported_exp).sort_values(
+            list(self.sort_values_by), ignore_index=True
+        )
 
-            assert df_imported.shape == df_exp.shape, (
-                'The shape of the imported DataFrame is incorrect!'
-            )
-            df_imported = df_imported.loc[:, df_exp.columns.tolist()]
+        assert df_imported.shape == df_exp.shape, (
+            'The shape of the imported DataFrame is incorrect!'
+        )
+        df_imported = df_imported.loc[:, df_exp.columns.tolist()]
 
-            assert_frame_equal(df_imported, df_exp)
+        assert_frame_equal(df_imported, df_exp)
 
+        for i in range(0, 2):
             # Check that the imported file is moved to sub-directory success
             input_filename = input_filenames[i]
             target_dir = input_filename.parent / 'success'
@@ -404,13 +480,15 @@ class TestTariffAnalyzerImportFacilityContractCommand:
             assert len(target_files) == 1, 'Incorrect nr of items in target directory!'
 
             target_file = target_files[0]
-            assert filename_with_timestamp_pattern_regex.match(target_file.name) is not None, (
+            assert filename_with_timestamp_pattern_regex.fullmatch(target_file.name) is not None, (
                 'Filename of moved file is incorrect!'
             )
 
-            df_import = pd.read_parquet(target_file)
+            table_exp = pa.Table.from_pandas(dfs_to_import_exp[i])
 
-            assert_frame_equal(df_import, dfs_to_import_exp[i], check_dtype=False)
+            assert pq.read_table(target_file).equals(table_exp), (
+                'Content of moved file is incorrect!'
+            )
 
         # Clean up - None
         # ===========================================================
@@ -418,6 +496,7 @@ class TestTariffAnalyzerImportFacilityContractCommand:
     @pytest.mark.usefixtures(
         'default_config_file_location_does_not_exist',
         'config_import_method_file_in_config_file_env_var',
+        'empty_sqlite_db',
     )
     def test_import_active_energy_cons_and_active_energy_prod(self) -> None:
         r"""Test to import only active energy consumption and production."""
@@ -434,7 +513,6 @@ class TestTariffAnalyzerImportFacilityContractCommand:
             DataSource.MAX_DEB_ACTIVE_POWER_CONS_LOW_LOAD,
         )
 
-        runner = CliRunner()
         args = [
             'ta',
             'import',
@@ -445,7 +523,7 @@ class TestTariffAnalyzerImportFacilityContractCommand:
 
         # Exercise
         # ===========================================================
-        result = runner.invoke(cli=main, args=args, catch_exceptions=False)
+        result = self.runner.invoke(cli=main, args=args, catch_exceptions=False)
 
         # Verify
         # ===========================================================
@@ -473,12 +551,11 @@ class TestTariffAnalyzerImportFacilityContractCommand:
             f'No configuration found for "tariff_analyzer.data.{DataSource.ACTIVE_ENERGY_CONS}"!\n'
         )
 
-        runner = CliRunner()
         args = ['ta', 'import', 'meter-data', DataSource.ACTIVE_ENERGY_CONS.value]
 
         # Exercise
         # ===========================================================
-        result = runner.invoke(cli=main, args=args, catch_exceptions=False)
+        result = self.runner.invoke(cli=main, args=args, catch_exceptions=False)
 
         # Verify
         # ===========================================================
@@ -496,12 +573,11 @@ class TestTariffAnalyzerImportFacilityContractCommand:
         # Setup
         # ===========================================================
         exit_code_exp = 2
-        runner = CliRunner()
         args = ['ta', 'import', 'meter-data', 'invalid']
 
         # Exercise
         # ===========================================================
-        result = runner.invoke(cli=main, args=args, catch_exceptions=False)
+        result = self.runner.invoke(cli=main, args=args, catch_exceptions=False)
 
         # Verify
         # ===========================================================
@@ -515,6 +591,7 @@ class TestTariffAnalyzerImportFacilityContractCommand:
     @pytest.mark.usefixtures(
         'default_config_file_location_does_not_exist',
         'config_import_method_file_in_config_file_env_var',
+        'empty_sqlite_db',
     )
     def test_no_input_file_found(
         self, config_data_import_method_file: tuple[str, ConfigManager]
@@ -533,12 +610,11 @@ class TestTariffAnalyzerImportFacilityContractCommand:
 
             patterns_exp.append(f'{cfg.path}/*.parquet')
 
-        runner = CliRunner()
         args = ['ta', 'import', 'meter-data']
 
         # Exercise
         # ===========================================================
-        result = runner.invoke(cli=main, args=args, catch_exceptions=False)
+        result = self.runner.invoke(cli=main, args=args, catch_exceptions=False)
 
         # Verify
         # ===========================================================
@@ -556,6 +632,7 @@ class TestTariffAnalyzerImportFacilityContractCommand:
     @pytest.mark.usefixtures(
         'default_config_file_location_does_not_exist',
         'config_import_method_file_in_config_file_env_var',
+        'empty_sqlite_db',
     )
     def test_missing_values_in_required_columns(
         self,
@@ -576,12 +653,11 @@ class TestTariffAnalyzerImportFacilityContractCommand:
         )
         message_exp = f'Found rows ({len(eans_exp)}) with missing values in required columns'
 
-        runner = CliRunner()
         args = ['ta', 'import', 'meter-data', DataSource.ACTIVE_ENERGY_CONS.value]
 
         # Exercise
         # ===========================================================
-        result = runner.invoke(cli=main, args=args, catch_exceptions=False)
+        result = self.runner.invoke(cli=main, args=args, catch_exceptions=False)
 
         # Verify
         # ===========================================================
@@ -621,12 +697,11 @@ class TestTariffAnalyzerImportFacilityContractCommand:
         )
         message_exp = 'Found duplicate rows (1) over columns:'
 
-        runner = CliRunner()
         args = ['ta', 'import', 'meter-data', DataSource.ACTIVE_ENERGY_CONS.value]
 
         # Exercise
         # ===========================================================
-        result = runner.invoke(cli=main, args=args, catch_exceptions=False)
+        result = self.runner.invoke(cli=main, args=args, catch_exceptions=False)
 
         # Verify
         # ===========================================================
@@ -667,12 +742,11 @@ class TestTariffAnalyzerImportFacilityContractCommand:
             f'"{SerieValueDataFrameModel.c_serie_type_code}" or "{SerieValueDataFrameModel.c_ean}"!'
         )
 
-        runner = CliRunner()
         args = ['ta', 'import', 'meter-data', DataSource.ACTIVE_ENERGY_CONS.value]
 
         # Exercise
         # ===========================================================
-        result = runner.invoke(cli=main, args=args, catch_exceptions=False)
+        result = self.runner.invoke(cli=main, args=args, catch_exceptions=False)
 
         # Verify
         # ===========================================================
@@ -691,6 +765,7 @@ class TestTariffAnalyzerImportFacilityContractCommand:
     @pytest.mark.usefixtures(
         'default_config_file_location_does_not_exist',
         'config_import_method_file_in_config_file_env_var',
+        'empty_sqlite_db',
     )
     def test_date_id_not_at_start_of_month(
         self,
@@ -703,12 +778,11 @@ class TestTariffAnalyzerImportFacilityContractCommand:
         _, eans_exp = active_energy_cons_parquet_file_date_id_not_at_month_start
         message_exp = f'Found rows ({len(eans_exp)}) not at start of month!'
 
-        runner = CliRunner()
         args = ['ta', 'import', 'meter-data', DataSource.ACTIVE_ENERGY_CONS.value]
 
         # Exercise
         # ===========================================================
-        result = runner.invoke(cli=main, args=args, catch_exceptions=False)
+        result = self.runner.invoke(cli=main, args=args, catch_exceptions=False)
 
         # Verify
         # ===========================================================
@@ -727,6 +801,7 @@ class TestTariffAnalyzerImportFacilityContractCommand:
     @pytest.mark.usefixtures(
         'default_config_file_location_does_not_exist',
         'config_import_method_file_in_config_file_env_var',
+        'empty_sqlite_db',
         'active_energy_cons_parquet_file_missing_required_columns',
     )
     def test_missing_required_columns(self) -> None:
@@ -745,12 +820,11 @@ class TestTariffAnalyzerImportFacilityContractCommand:
         required_cols_exp = f"('{c_date_id}', '{c_ean}', '{c_serie_type_code}', '{c_serie_value}')"
         available_cols_exp = f"('{c_serie_type_code}', '{c_serie_value}', '{c_status_id}')"
 
-        runner = CliRunner()
         args = ['ta', 'import', 'meter-data', DataSource.ACTIVE_ENERGY_CONS.value]
 
         # Exercise
         # ===========================================================
-        result = runner.invoke(cli=main, args=args, catch_exceptions=False)
+        result = self.runner.invoke(cli=main, args=args, catch_exceptions=False)
 
         # Verify
         # ===========================================================
@@ -769,18 +843,18 @@ class TestTariffAnalyzerImportFacilityContractCommand:
     @pytest.mark.usefixtures(
         'default_config_file_location_does_not_exist',
         'config_import_method_file_in_config_file_env_var',
+        'empty_sqlite_db',
     )
     def test_empty_input_file(self, empty_active_energy_cons_import_parquet_file: Path) -> None:
         r"""Test to import active energy consumption from an empty parquet file."""
 
         # Setup
         # ===========================================================
-        runner = CliRunner()
         args = ['ta', 'import', 'meter-data', DataSource.ACTIVE_ENERGY_CONS.value]
 
         # Exercise
         # ===========================================================
-        result = runner.invoke(cli=main, args=args, catch_exceptions=False)
+        result = self.runner.invoke(cli=main, args=args, catch_exceptions=False)
 
         # Verify
         # ===========================================================
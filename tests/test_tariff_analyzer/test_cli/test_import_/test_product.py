@@ -7,14 +7,19 @@ r"""Unit tests for the module cli.tariff_analyzer.import_.product."""
 
 # Standard library
 import re
+import shutil
 from pathlib import Path
+from typing import ClassVar, cast
 
 # Third party
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import pytest
 from click.testing import CliRunner
 from pandas.testing import assert_frame_equal
-from sqlalchemy import select
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
 
 # Local
 from elsabio.cli.main import main
@@ -32,8 +37,48 @@ from elsabio.models.tariff_analyzer import (
 # =================================================================================================
 
 
+@pytest.fixture(scope='session')
+def sqlite_db_with_2_products_template(
+    initialized_sqlite_db_template: Path, tmp_path_factory: pytest.TempPathFactory
+) -> Path:
+    r"""An initialized SQLite database file with 2 products persisted.
+
+    The database is created once per test session and the file
+    is copied by `sqlite_db_with_2_products`.
+
+    Returns
+    -------
+    pathlib.Path
+        The path to the database file.
+    """
+
+    path = tmp_path_factory.mktemp('db_template') / 'ElSabio_2_products.db'
+    shutil.copyfile(initialized_sqlite_db_template, path)
+    engine = create_engine(url=URL.create('sqlite', database=str(path)))
+
+    products = [
+        {
+            'product_id': 1,
+            'external_id': 14001,
+            'name': 'APARTMENT',
+            'description': 'Description to update',
+        },
+        {'product_id': 2, 'external_id': 27001, 'name': 'Fuse Size', 'description': None},
+    ]
+
+    with sessionmaker(bind=engine)() as session:
+        session.execute(insert(Product), products)
+        session.commit()
+
+    engine.dispose()
+
+    return path
+
+
 @pytest.fixture
-def sqlite_db_with_2_products(initialized_sqlite_db: tuple[SessionFactory, URL]) -> SessionFactory:
+def sqlite_db_with_2_products(
+    sqlite_db_with_2_products_template: Path, sqlite_db_url: URL
+) -> SessionFactory:
     r"""An ElSabio SQLite database with 2 products persisted.
 
     Returns
@@ -42,22 +87,44 @@ def sqlite_db_with_2_products(initialized_sqlite_db: tuple[SessionFactory, URL])
         The session factory that can produce new database sessions.
     """
 
-    session_factory, _ = initialized_sqlite_db
+    shutil.copyfile(sqlite_db_with_2_products_template, cast(str, sqlite_db_url.database))
 
-    with session_factory() as session:
-        p1 = Product(
-            product_id=1, external_id=14001, name='APARTMENT', description='Description to update'
-        )
-        p2 = Product(product_id=2, external_id=27001, name='Fuse Size')
-        session.add_all((p1, p2))
+    return sessionmaker(bind=create_engine(url=sqlite_db_url))
+
+
+@pytest.fixture(scope='session')
+def sqlite_db_with_all_products_template(
+    initialized_sqlite_db_template: Path,
+    product_model: ProductDataFrameModel,
+    tmp_path_factory: pytest.TempPathFactory,
+) -> Path:
+    r"""An initialized SQLite database file with all test products persisted.
+
+    The database is created once per test session and the file
+    is copied by `sqlite_db_with_all_products`.
+
+    Returns
+    -------
+    pathlib.Path
+        The path to the database file.
+    """
+
+    path = tmp_path_factory.mktemp('db_template') / 'ElSabio_all_products.db'
+    shutil.copyfile(initialized_sqlite_db_template, path)
+    engine = create_engine(url=URL.create('sqlite', database=str(path)))
+
+    with sessionmaker(bind=engine)() as session:
+        session.execute(insert(Product), product_model.df.to_dict(orient='records'))
         session.commit()
 
-    return session_factory
+    engine.dispose()
+
+    return path
 
 
 @pytest.fixture
 def sqlite_db_with_all_products(
-    initialized_sqlite_db: tuple[SessionFactory, URL], product_model: ProductDataFrameModel
+    sqlite_db_with_all_products_template: Path, sqlite_db_url: URL
 ) -> SessionFactory:
     r"""An ElSabio SQLite database with all test products persisted.
 
@@ -67,19 +134,33 @@ def sqlite_db_with_all_products(
         The session factory that can produce new database sessions.
     """
 
-    session_factory, _ = initialized_sqlite_db
+    shutil.copyfile(sqlite_db_with_all_products_template, cast(str, sqlite_db_url.database))
 
-    with session_factory() as session:
-        product_model.df.to_sql(
-            name=Product.__tablename__, con=session.get_bind(), if_exists='append', index=False
-        )
+    return sessionmaker(bind=create_engine(url=sqlite_db_url))
 
-    return session_factory
+
+@pytest.fixture(scope='session')
+def product_import_parquet_file_cached(
+    product_model_to_import: ProductImportDataFrameModel,
+    tmp_path_factory: pytest.TempPathFactory,
+) -> Path:
+    r"""The product input data written once per test session.
+
+    Returns
+    -------
+    file : pathlib.Path
+        The full path to the parquet file to copy into the input directory of a test.
+    """
+
+    file = tmp_path_factory.mktemp('parquet_cache') / 'products.parquet'
+    product_model_to_import.df.to_parquet(path=file, compression=None)
+
+    return file
 
 
 @pytest.fixture
 def product_import_parquet_file(
-    product_model_to_import: ProductImportDataFrameModel,
+    product_import_parquet_file_cached: Path,
     config_data_import_method_file: tuple[str, ConfigManager],
 ) -> Path:
     r"""Write the product input data parquet file.
@@ -97,7 +178,7 @@ def product_import_parquet_file(
     assert product_data is not None, 'Missing configuration "tariff_analyzer.data.product"!'
 
     file = product_data.path / 'products.parquet'
-    product_model_to_import.df.to_parquet(path=file)
+    shutil.copyfile(product_import_parquet_file_cached, file)
 
     return file
 
@@ -130,13 +211,25 @@ def product_parquet_file_missing_values_in_required_columns(
     c_external_id = ProductImportDataFrameModel.c_external_id
     c_name = ProductImportDataFrameModel.c_name
 
-    df = product_model_to_import.df.copy()
-    df.loc[3, c_external_id] = None
-    df.loc[5, c_name] = None
-    external_ids = (str(df.loc[3, c_external_id]), str(df.loc[5, c_external_id]))
+    row_missing_external_id = 3
+    row_missing_name = 4
+
+    df_source = product_model_to_import.df
+    df = df_source.assign(
+        **{
+            c_external_id: df_source[c_external_id].where(
+                df_source.index != row_missing_external_id
+            ),
+            c_name: df_source[c_name].where(df_source.index != row_missing_name),
+        }
+    )
+    external_ids = (
+        str(df_source.loc[row_missing_external_id, c_external_id]),
+        str(df_source.loc[row_missing_name, c_external_id]),
+    )
 
     file = data.path / 'products.parquet'
-    df.to_parquet(path=file)
+    df.to_parquet(path=file, compression=None)
 
     return file, external_ids
 
@@ -168,14 +261,17 @@ def product_parquet_file_with_duplicate_external_id_rows(
     c_external_id = ProductImportDataFrameModel.c_external_id
     c_name = ProductImportDataFrameModel.c_name
 
-    df = product_model_to_import.df.copy()
-    duplicate_row = df.shape[0] + 1
-    df.loc[duplicate_row, :] = df.loc[3, :]
-    df.loc[duplicate_row, c_name] = 'test'
-    external_id = str(df.loc[3, c_external_id])
+    row_duplicate = 3
+
+    df_source = product_model_to_import.df
+    df_duplicate = df_source.loc[[row_duplicate], :].assign(
+        **{c_name: pd.array(['test'], dtype=df_source[c_name].dtype)}
+    )
+    df = pd.concat([df_source, df_duplicate], ignore_index=True)
+    external_id = str(df_source.loc[row_duplicate, c_external_id])
 
     file = data.path / 'products.parquet'
-    df.to_parquet(path=file)
+    df.to_parquet(path=file, compression=None)
 
     return file, external_id
 
@@ -206,21 +302,24 @@ def product_parquet_file_with_duplicate_name_rows(
     c_external_id = ProductImportDataFrameModel.c_external_id
     c_name = ProductImportDataFrameModel.c_name
 
-    df = product_model_to_import.df.copy()
-    duplicate_row = df.shape[0] + 1
-    df.loc[duplicate_row, :] = df.loc[3, :]
-    df.loc[duplicate_row, c_external_id] = 'unique_new'
-    name = str(df.loc[3, c_name])
+    row_duplicate = 3
+
+    df_source = product_model_to_import.df
+    df_duplicate = df_source.loc[[row_duplicate], :].assign(
+        **{c_external_id: pd.array(['unique_new'], dtype=df_source[c_external_id].dtype)}
+    )
+    df = pd.concat([df_source, df_duplicate], ignore_index=True)
+    name = str(df_source.loc[row_duplicate, c_name])
 
     file = data.path / 'products.parquet'
-    df.to_parquet(path=file)
+    df.to_parquet(path=file, compression=None)
 
     return file, name
 
 
 @pytest.fixture
 def product_import_parquet_file_missing_external_id_column(
-    product_model_to_import: ProductImportDataFrameModel,
+    product_import_parquet_file_cached: Path,
     config_data_import_method_file: tuple[str, ConfigManager],
 ) -> Path:
     r"""Write the product input data parquet file with the `external_id` column missing.
@@ -237,10 +336,12 @@ def product_import_parquet_file_missing_external_id_column(
     product_data = data.get(DataSource.PRODUCT)
     assert product_data is not None, 'Missing configuration "tariff_analyzer.data.product"!'
 
-    df = product_model_to_import.df.copy().drop(columns=[ProductImportDataFrameModel.c_external_id])
+    table = pq.read_table(product_import_parquet_file_cached).drop_columns(
+        [ProductImportDataFrameModel.c_external_id]
+    )
 
     file = product_data.path / 'products.parquet'
-    df.to_parquet(path=file)
+    pq.write_table(table, file, compression='none')
 
     return file
 
@@ -266,7 +367,7 @@ def empty_product_import_parquet_file(
     df = pd.DataFrame()
 
     file = product_data.path / 'products.parquet'
-    df.to_parquet(path=file)
+    df.to_parquet(path=file, compression=None)
 
     return file
 
@@ -276,9 +377,12 @@ def empty_product_import_parquet_file(
 # =================================================================================================
 
 
+@pytest.mark.slow
 class TestTariffAnalyzerImportProductCommand:
     r"""Tests for CLI command `ta import product`."""
 
+    runner: ClassVar[CliRunner] = CliRunner()
+
     @pytest.mark.usefixtures(
         'default_config_file_location_does_not_exist',
         'config_import_method_file_in_config_file_env_var',
@@ -325,12 +429,11 @@ class TestTariffAnalyzerImportProductCommand:
         else:
             session_factory = db
 
-        runner = CliRunner()
         args = ['ta', 'import', 'product']
 
         # Exercise
         # ===========================================================
-        result = runner.invoke(cli=main, args=args, catch_exceptions=False)
+        result = self.runner.invoke(cli=main, args=args, catch_exceptions=False)
 
         # Verify
         # ===========================================================
@@ -339,17 +442,18 @@ class TestTariffAnalyzerImportProductCommand:
         assert result.exit_code == 0, 'Exit code is not 0!'
         assert message_exp in result.output, 'Expected message missing in terminal output!'
 
-        query = select(Product).order_by(Product.external_id.asc())
+        df_exp = product_model.df
+        query = select(*(Product.__table__.c[col] for col in df_exp.columns)).order_by(
+            Product.external_id.asc()
+        )
 
         with session_factory() as session:
-            df_product = pd.read_sql(
-                sql=query,
-                con=session.get_bind(),
-                dtype_backend='pyarrow',
-                dtype=ProductDataFrameModel.dtypes,
-            )
+            result_product = session.connection().execute(query)
+            df_product = pd.DataFrame(
+                data=result_product.all(), columns=list(result_product.keys()), dtype=object
+            ).astype(ProductDataFrameModel.dtypes)
 
-        assert_frame_equal(df_product, product_model.df)
+        assert_frame_equal(df_product, df_exp)
 
         # Check that imported file is moved to sub-directory success
         target_dir = input_filename.parent / 'success'
@@ -359,13 +463,15 @@ class TestTariffAnalyzerImportProductCommand:
         assert len(target_files) == 1, 'Incorrect nr of items in target directory!'
 
         target_file = target_files[0]
-        assert filename_with_timestamp_pattern_regex.match(target_file.name) is not None, (
+        assert filename_with_timestamp_pattern_regex.fullmatch(target_file.name) is not None, (
             'Filename of moved file is incorrect!'
         )
 
-        df_import = pd.read_parquet(target_file)
+        table_exp = pa.Table.from_pandas(product_model_to_import.df)
 
-        assert_frame_equal(df_import, product_model_to_import.df, check_dtype=False)
+        assert pq.read_table(target_file, columns=table_exp.column_names).equals(table_exp), (
+            'Content of moved file is incorrect!'
+        )
 
         # Clean up - None
         # ===========================================================
@@ -380,12 +486,11 @@ class TestTariffAnalyzerImportProductCommand:
             f'No data configuration found for "tariff_analyzer.data.{DataSource.PRODUCT}"!\n'
         )
 
-        runner = CliRunner()
         args = ['ta', 'import', 'product']
 
         # Exercise
         # ===========================================================
-        result = runner.invoke(cli=main, args=args, catch_exceptions=False)
+        result = self.runner.invoke(cli=main, args=args, catch_exceptions=False)
 
         # Verify
         # ===========================================================
@@ -417,12 +522,11 @@ class TestTariffAnalyzerImportProductCommand:
 
         pattern_exp = f'{cfg.path}/*.parquet'
 
-        runner = CliRunner()
         args = ['ta', 'import', 'product']
 
         # Exercise
         # ===========================================================
-        result = runner.invoke(cli=main, args=args, catch_exceptions=False)
+        result = self.runner.invoke(cli=main, args=args, catch_exceptions=False)
 
         # Verify
         # ===========================================================
@@ -455,12 +559,11 @@ class TestTariffAnalyzerImportProductCommand:
             f'Found rows ({len(external_ids_exp)}) with missing values in required columns'
         )
 
-        runner = CliRunner()
         args = ['ta', 'import', 'product']
 
         # Exercise
         # ===========================================================
-        result = runner.invoke(cli=main, args=args, catch_exceptions=False)
+        result = self.runner.invoke(cli=main, args=args, catch_exceptions=False)
 
         # Verify
         # ===========================================================
@@ -505,12 +608,11 @@ class TestTariffAnalyzerImportProductCommand:
         _, external_id_exp = request.getfixturevalue(fixture_func)
         message_exp = 'Found duplicate rows (1) over columns:'
 
-        runner = CliRunner()
         args = ['ta', 'import', 'product']
 
         # Exercise
         # ===========================================================
-        result = runner.invoke(cli=main, args=args, catch_exceptions=False)
+        result = self.runner.invoke(cli=main, args=args, catch_exceptions=False)
 
         # Verify
         # ===========================================================
@@ -548,12 +650,11 @@ class TestTariffAnalyzerImportProductCommand:
         required_cols_exp = f"('{c_external_id}', '{c_name}')"
         available_cols_exp = f"('{c_description}', '{c_name}')"
 
-        runner = CliRunner()
         args = ['ta', 'import', 'product']
 
         # Exercise
         # ===========================================================
-        result = runner.invoke(cli=main, args=args, catch_exceptions=False)
+        result = self.runner.invoke(cli=main, args=args, catch_exceptions=False)
 
         # Verify
         # ===========================================================
@@ -577,12 +678,11 @@ class TestTariffAnalyzerImportProductCommand:
 
         # Setup
         # ===========================================================
-        runner = CliRunner()
         args = ['ta', 'import', 'product']
 
         # Exercise
         # ===========================================================
-        result = runner.invoke(cli=main, args=args, catch_exceptions=False)
+        result = self.runner.invoke(cli=main, args=args, catch_exceptions=False)
 
         # Verify
         # ===========================================================
@@ -0,0 +1,6 @@
+# ElSabio
+# Copyright (C) 2025-present Anton Lydell
+# SPDX-License-Identifier: GPL-3.0-or-later
+# See the LICENSE file in the project root for details.
+
+r"""Unit tests for the sub-package `elsabio.operations.tariff_analyzer`."""
@@ -0,0 +1,212 @@
+# ElSabio
+# Copyright (C) 2025-present Anton Lydell
+# SPDX-License-Identifier: GPL-3.0-or-later
+# See the LICENSE file in the project root for details.
+
+r"""Unit tests for the module operations.tariff_analyzer.import_.facility."""
+
+# Standard library
+from typing import ClassVar
+
+# Third party
+import duckdb
+import pandas as pd
+import pyarrow as pa
+import pytest
+from pandas.testing import assert_frame_equal
+
+# Local
+from elsabio.models.tariff_analyzer import (
+    FacilityImportDataFrameModel,
+    FacilityMappingDataFrameModel,
+    FacilityTypeMappingDataFrameModel,
+)
+from elsabio.operations.tariff_analyzer.import_.facility import (
+    create_facility_upsert_dataframes_chunked,
+)
+
+# =================================================================================================
+# Fixtures
+# =================================================================================================
+
+
+@pytest.fixture
+def facility_mapping_models() -> tuple[
+    FacilityMappingDataFrameModel, FacilityTypeMappingDataFrameModel
+]:
+    r"""The facility and facility type mapping models of an existing facility.
+
+    Returns
+    -------
+    facility_model : elsabio.models.tariff_analyzer.FacilityMappingDataFrameModel
+        The facility with `facility_id` 1 and `ean` 735999999999999991.
+
+    facility_type_model : elsabio.models.tariff_analyzer.FacilityTypeMappingDataFrameModel
+        The facility types consumption (1) and production (2).
+    """
+
+    facility_model = FacilityMappingDataFrameModel(
+        df=pd.DataFrame(
+            {
+                FacilityMappingDataFrameModel.c_facility_id: [1],
+                FacilityMappingDataFrameModel.c_ean: [735999999999999991],
+            }
+        ).astype(FacilityMappingDataFrameModel.dtypes)
+    )
+    facility_type_model = FacilityTypeMappingDataFrameModel(
+        df=pd.DataFrame(
+            {
+                FacilityTypeMappingDataFrameModel.c_facility_type_id: [1, 2],
+                FacilityTypeMappingDataFrameModel.c_code: ['consumption', 'production'],
+            }
+        ).astype(FacilityTypeMappingDataFrameModel.dtypes)
+    )
+
+    return facility_model, facility_type_model
+
+
+# =================================================================================================
+# Tests
+# =================================================================================================
+
+
+class TestCreateFacilityUpsertDataframesChunked:
+    r"""Tests for the function `create_facility_upsert_dataframes_chunked`."""
+
+    c_ean: ClassVar[str] = FacilityImportDataFrameModel.c_ean
+    c_ean_prod: ClassVar[str] = FacilityImportDataFrameModel.c_ean_prod
+    c_facility_type_code: ClassVar[str] = FacilityImportDataFrameModel.c_facility_type_code
+    c_name: ClassVar[str] = FacilityImportDataFrameModel.c_name
+    c_facility_id: ClassVar[str] = FacilityMappingDataFrameModel.c_facility_id
+    c_facility_type_id: ClassVar[str] = FacilityTypeMappingDataFrameModel.c_facility_type_id
+
+    def test_chunk_size_1(
+        self,
+        facility_mapping_models: tuple[
+            FacilityMappingDataFrameModel, FacilityTypeMappingDataFrameModel
+        ],
+    ) -> None:
+        r"""Test to create one chunk per facility with one existing and two new facilities."""
+
+        # Setup
+        # ===========================================================
+        facility_model, facility_type_model = facility_mapping_models
+        table = pa.Table.from_pydict(
+            {
+                self.c_ean: [735999999999999991, 735999999999999992, 735999999999999993],
+                self.c_ean_prod: [None, 735999999999999994, None],
+                self.c_facility_type_code: ['consumption', 'production', 'consumption'],
+                self.c_name: ['Existing', 'New production', 'New consumption'],
+            },
+            schema=pa.schema(
+                [
+                    (self.c_ean, pa.uint64()),
+                    (self.c_ean_prod, pa.uint64()),
+                    (self.c_facility_type_code, pa.string()),
+                    (self.c_name, pa.string()),
+                ]
+            ),
+        )
+
+        df_insert_exp = pd.DataFrame(
+            {
+                self.c_facility_type_id: pd.array([2, 1], dtype='Int64'),
+                self.c_ean: pd.array([735999999999999992, 735999999999999993], dtype='Int64'),
+                self.c_ean_prod: pd.array([735999999999999994, None], dtype='Int64'),
+                self.c_name: ['New production', 'New consumption'],
+            }
+        )
+
+        df_update_exp = pd.DataFrame(
+            {
+                self.c_facility_id: pd.array([1], dtype='Int64'),
+                self.c_facility_type_id: pd.array([1], dtype='Int64'),
+                self.c_ean: pd.array([735999999999999991], dtype='Int64'),
+                self.c_ean_prod: pd.array([None], dtype='Int64'),
+                self.c_name: ['Existing'],
+            }
+        )
+
+        with duckdb.connect() as conn:
+            import_model = conn.from_arrow(table)
+
+            # Exercise
+            # ===========================================================
+            chunks, df_invalid, result = create_facility_upsert_dataframes_chunked(
+                import_model=import_model,
+                facility_model=facility_model,
+                facility_type_model=facility_type_model,
+                conn=conn,
+                chunk_size=1,
+            )
+            dfs_chunks = list(chunks)
+
+        # Verify
+        # ===========================================================
+        assert result.ok is True, 'result.ok is not True!'
+        assert df_invalid.empty, 'df_invalid is not empty!'
+        assert len(dfs_chunks) == table.num_rows, 'Incorrect nr of chunks!'
+
+        for dfs in dfs_chunks:
+            assert dfs.insert.shape[0] + dfs.update.shape[0] == 1, 'Chunk is not of size 1!'
+            assert dfs.invalid.empty, 'dfs.invalid of chunk is not empty!'
+
+        df_insert = pd.concat([dfs.insert for dfs in dfs_chunks]).sort_values(
+            self.c_ean, ignore_index=True
+        )
+        df_update = pd.concat([dfs.update for dfs in dfs_chunks], ignore_index=True)
+
+        print(f'df_insert:\n{df_insert}\n')
+        print(f'df_update:\n{df_update}\n')
+
+        assert_frame_equal(df_insert, df_insert_exp)
+        assert_frame_equal(df_update, df_update_exp)
+
+        # Clean up - None
+        # ===========================================================
+
+    def test_invalid_facility_type_code(
+        self,
+        facility_mapping_models: tuple[
+            FacilityMappingDataFrameModel, FacilityTypeMappingDataFrameModel
+        ],
+    ) -> None:
+        r"""Test that no chunks are created if there are invalid facility type codes."""
+
+        # Setup
+        # ===========================================================
+        facility_model, facility_type_model = facility_mapping_models
+        table = pa.Table.from_pydict(
+            {
+                self.c_ean: [735999999999999992, 735999999999999993],
+                self.c_facility_type_code: ['invalid', 'consumption'],
+            },
+            schema=pa.schema([(self.c_ean, pa.uint64()), (self.c_facility_type_code, pa.string())]),
+        )
+
+        with duckdb.connect() as conn:
+            import_model = conn.from_arrow(table)
+
+            # Exercise
+            # ===========================================================
+            chunks, df_invalid, result = create_facility_upsert_dataframes_chunked(
+                import_model=import_model,
+                facility_model=facility_model,
+                facility_type_model=facility_type_model,
+                conn=conn,
+                chunk_size=1,
+            )
+            dfs_chunks = list(chunks)
+
+        # Verify
+        # ===========================================================
+        print(result.short_msg)
+        print(df_invalid)
+
+        assert result.ok is False, 'result.ok is not False!'
+        assert dfs_chunks == [], 'Chunks were created despite invalid data!'
+        assert df_invalid.shape[0] == 1, 'Incorrect nr of invalid rows!'
+        assert df_invalid[self.c_ean].tolist() == [735999999999999992], 'Incorrect invalid row!'
+
+        # Clean up - None
+        # ===========================================================
@@ -0,0 +1,108 @@
+# ElSabio
+# Copyright (C) 2025-present Anton Lydell
+# SPDX-License-Identifier: GPL-3.0-or-later
+# See the LICENSE file in the project root for details.
+
+r"""Unit tests for the module operations.tariff_analyzer.import_.product."""
+
+# Standard library
+from typing import Any
+
+# Third party
+import duckdb
+import pyarrow as pa
+import pytest
+
+# Local
+from elsabio.models.tariff_analyzer import ProductImportDataFrameModel
+from elsabio.operations.tariff_analyzer.import_.product import validate_product_import_data
+
+# =================================================================================================
+# Tests
+# =================================================================================================
+
+
+class TestValidateProductImportData:
+    r"""Tests for the function `validate_product_import_data`."""
+
+    c_external_id = ProductImportDataFrameModel.c_external_id
+    c_name = ProductImportDataFrameModel.c_name
+
+    def test_valid_data(self) -> None:
+        r"""Test to validate product import data without any errors."""
+
+        # Setup
+        # ===========================================================
+        table = pa.Table.from_pydict(
+            {
+                self.c_external_id: ['14001', '27001', '45001'],
+                self.c_name: ['Apartment', 'Fuse Size', 'Production'],
+            }
+        )
+        model = duckdb.from_arrow(table)
+
+        # Exercise
+        # ===========================================================
+        result, df_invalid = validate_product_import_data(model=model)
+
+        # Verify
+        # ===========================================================
+        assert result.ok is True, 'result.ok is not True!'
+        assert df_invalid.empty, 'df_invalid is not empty!'
+
+        # Clean up - None
+        # ===========================================================
+
+    @pytest.mark.parametrize(
+        ('data', 'message_exp', 'nr_invalid_exp'),
+        [
+            pytest.param(
+                {'external_id': ['14001', '27001'], 'description': ['A', 'B']},
+                'Missing the required columns!',
+                0,
+                id='Missing column name',
+            ),
+            pytest.param(
+                {'external_id': ['14001', None, '45001'], 'name': ['Apartment', 'Fuse Size', None]},
+                'Found rows (2) with missing values in required columns',
+                2,
+                id='Missing values',
+            ),
+            pytest.param(
+                {'external_id': ['14001', '14001', '45001'], 'name': ['Apartment', 'Test', 'Prod']},
+                "Found duplicate rows (1) over columns: ('external_id',)!",
+                1,
+                id='Duplicate external_id',
+            ),
+            pytest.param(
+                {'external_id': ['14001', '27001', '45001'], 'name': ['Apartment', 'Prod', 'Prod']},
+                "Found duplicate rows (1) over columns: ('name',)!",
+                1,
+                id='Duplicate name',
+            ),
+        ],
+    )
+    def test_invalid_data(
+        self, data: dict[str, list[Any]], message_exp: str, nr_invalid_exp: int
+    ) -> None:
+        r"""Test to validate product import data with invalid data."""
+
+        # Setup
+        # ===========================================================
+        model = duckdb.from_arrow(pa.Table.from_pydict(data))
+
+        # Exercise
+        # ===========================================================
+        result, df_invalid = validate_product_import_data(model=model)
+
+        # Verify
+        # ===========================================================
+        print(result.short_msg)
+        print(df_invalid)
+
+        assert result.ok is False, 'result.ok is not False!'
+        assert message_exp in result.short_msg, 'Expected message missing in result.short_msg!'
+        assert df_invalid.shape[0] == nr_invalid_exp, 'Incorrect nr of invalid rows!'
+
+        # Clean up - None
+        # ===========================================================